@@ -7,24 +7,69 @@ including service/staff listing, availability checking, and booking creation.
 Integrates with the existing salon_data.db SQLite database.
 """
 
-from flask import Flask, render_template, request, jsonify, g
+from flask import Flask, render_template, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+from flask_caching import Cache
 from datetime import datetime, date, timedelta
-from functools import wraps
+from functools import wraps, lru_cache
+from bisect import bisect_left
 import sqlite3
+import threading
 import re
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from database import NO_OVERLAP_TRIGGERS_SQL
 
 # Load environment variables
 load_dotenv()
 
+# SMS confirmations are optional
+try:
+    from sms_utils import send_confirmation_sms
+except ImportError:
+    send_confirmation_sms = None
+
+# Reminders queued at booking time are optional too; schedule_reminder
+# itself returns False when APScheduler is not installed
+try:
+    from sms_reminder import schedule_reminder
+except ImportError:
+    schedule_reminder = None
+
+# Try to import orjson for faster JSON responses (optional dependency)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes responses with orjson."""
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
 
 # Use absolute path for database based on app location
 app_dir = os.path.dirname(os.path.abspath(__file__))
 app.config['DATABASE'] = os.path.join(app_dir, os.getenv('DATABASE_PATH', 'salon_data.db'))
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'belle-madame-secret-key')
 
+# In-process cache for the read-mostly catalog endpoints
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache'})
+
 # Salon opening hours configuration
 OPENING_HOURS = {
     0: (9, 19),   # Monday
@@ -36,25 +81,93 @@ OPENING_HOURS = {
     6: (9, 19),   # Sunday
 }
 
+# Dates ahead of today with precomputed opening hours (see get_opening_hours)
+BOOKING_HORIZON_DAYS = 120
+_date_hours = {}
+_date_hours_built = None
+
+# Background workers for outbound SMS
+_sms_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='sms')
+
+# Per-thread SQLite connection holder (see get_db)
+_db_local = threading.local()
+
+# Databases that already have the no-overlap triggers; create_booking
+# relies on them instead of checking availability first
+_overlap_trigger_paths = set()
+
+# HH:MM labels for every half-hour of the day, indexed by half-hour number
+SLOT_LABELS = tuple(f"{h:02d}:{m:02d}" for h in range(24) for m in (0, 30))
+
+# Fields that must be present when creating a booking
+BOOKING_REQUIRED_FIELDS = ('client_name', 'phone', 'service_id', 'staff_id', 'date', 'hour')
+
+# Phone validation patterns (South African formats)
+PHONE_STRIP_RE = re.compile(r'[\s\-]')
+PHONE_RE = re.compile(r'^(?:\+?27|0)?[0-9]{9,10}$')
+
 
 def get_db():
     """
-    Get database connection for current request context.
-    Uses SQLite with foreign key support enabled.
+    Get the database connection for the current worker thread.
+    
+    Connections are opened once per thread and kept for the life of the
+    process so SQLite's page cache stays warm across requests, and reopened
+    if app.config['DATABASE'] points somewhere else (e.g. a test database).
+    Uses foreign key support and WAL journaling so availability reads are not
+    blocked by concurrent booking writes.
+    """
+    path = app.config['DATABASE']
+    conn = getattr(_db_local, 'conn', None)
+    if conn is not None and _db_local.path != path:
+        conn.close()
+        conn = None
+    if conn is None:
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA mmap_size = 134217728")
+        conn.execute("PRAGMA cache_size = -20000")  # ~20 MB page cache
+        conn.row_factory = sqlite3.Row
+        _ensure_overlap_triggers(conn, path)
+        _db_local.conn = conn
+        _db_local.path = path
+    return conn
+
+
+def _ensure_overlap_triggers(conn, path):
+    """
+    Install the no-overlap triggers the first time the process connects to
+    a database, so databases not set up through init-db still reject
+    double bookings.
     """
-    if 'db' not in g:
-        g.db = sqlite3.connect(app.config['DATABASE'])
-        g.db.execute("PRAGMA foreign_keys = ON")
-        g.db.row_factory = sqlite3.Row
-    return g.db
+    if path in _overlap_trigger_paths:
+        return
+    try:
+        for trigger_sql in NO_OVERLAP_TRIGGERS_SQL:
+            conn.execute(trigger_sql)
+        conn.commit()
+        _overlap_trigger_paths.add(path)
+    except sqlite3.OperationalError:
+        # No bookings table yet; init_database() creates both
+        conn.rollback()
+
+
+def _log_sms_failure(future):
+    """Log an exception raised by a background SMS send instead of losing it."""
+    exc = future.exception()
+    if exc is not None:
+        app.logger.error("Background SMS send failed", exc_info=exc)
 
 
 @app.teardown_appcontext
 def close_db(exception):
-    """Close database connection at end of request."""
-    db = g.pop('db', None)
-    if db is not None:
-        db.close()
+    """Roll back any transaction left open by the request; keep the connection."""
+    conn = getattr(_db_local, 'conn', None)
+    if conn is not None and conn.in_transaction:
+        conn.rollback()
 
 
 def init_database():
@@ -71,30 +184,44 @@ def init_database():
     c.execute('''CREATE TABLE IF NOT EXISTS services (id INTEGER PRIMARY KEY, category TEXT, name TEXT, price REAL, duration INTEGER)''')
     c.execute('''CREATE TABLE IF NOT EXISTS bookings (id INTEGER PRIMARY KEY, client_name TEXT, phone TEXT, service_id INTEGER, staff_id INTEGER, date TEXT, hour INTEGER, duration INTEGER, notes TEXT, created_at TEXT DEFAULT CURRENT_TIMESTAMP)''')
     c.execute('''CREATE TABLE IF NOT EXISTS staff_services (staff_id INTEGER, service_id INTEGER, PRIMARY KEY(staff_id, service_id))''')
+    c.execute('''CREATE TABLE IF NOT EXISTS sent_reminders (booking_id INTEGER, reminder_date TEXT, PRIMARY KEY(booking_id, reminder_date))''')
+    c.execute('''CREATE TABLE IF NOT EXISTS sms_daily_counts (phone TEXT, day TEXT, count INTEGER, PRIMARY KEY(phone, day))''')
+    
+    # Covering index for the per-staff, per-date availability lookups
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_bookings_staff_date ON bookings (staff_id, date, hour, duration)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_bookings_date_hour ON bookings (date, hour)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_services_category ON services (category, name)''')
+    # staff_services is keyed (staff_id, service_id); lookups filter by service
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_staff_services_service ON staff_services (service_id, staff_id)''')
+    
+    # Reject overlapping bookings for the same staff member
+    for trigger_sql in NO_OVERLAP_TRIGGERS_SQL:
+        c.execute(trigger_sql)
     
     conn.commit()
     return conn
 
 
+@app.cli.command('init-db')
+def init_db_command():
+    """Create missing tables and indexes (flask --app app init-db)."""
+    init_database()
+    print('Database initialized.')
+
+
 def validate_phone(phone):
     """
     Validate phone number format.
     Accepts South African formats: 0711234567, +27711234567, 071 123 4567
     """
     # Remove all whitespace and dashes
-    cleaned = re.sub(r'[\s\-]', '', phone)
-    # South African phone patterns
-    pattern = r'^(?:\+?27|0)?[0-9]{9,10}$'
-    return bool(re.match(pattern, cleaned))
+    cleaned = PHONE_STRIP_RE.sub('', phone)
+    return bool(PHONE_RE.match(cleaned))
 
 
 def validate_date(booking_date):
     """Validate that booking date is not in the past."""
-    try:
-        parsed_date = datetime.strptime(booking_date, '%Y-%m-%d').date()
-        return parsed_date >= date.today()
-    except (ValueError, TypeError):
-        return False
+    return parse_booking_date(booking_date)[0]
 
 
 def check_availability(db, staff_id, booking_date, start_hour, duration):
@@ -113,15 +240,21 @@ def check_availability(db, staff_id, booking_date, start_hour, duration):
     """
     c = db.cursor()
     
-    # Get all existing bookings for this staff member on this date
+    # Get all existing bookings for this staff member on this date,
+    # sorted by start (served straight from idx_bookings_staff_date)
     c.execute('''SELECT hour, duration FROM bookings 
-                 WHERE staff_id = ? AND date = ?''', (staff_id, booking_date))
+                 WHERE staff_id = ? AND date = ?
+                 ORDER BY hour''', (staff_id, booking_date))
     existing_bookings = c.fetchall()
     
     # Check for overlaps
     booking_end = start_hour + duration
     
-    for existing_hour, existing_duration in existing_bookings:
+    # Only bookings that start before the new one ends can overlap it
+    starts = [existing_hour for existing_hour, _ in existing_bookings]
+    candidates = existing_bookings[:bisect_left(starts, booking_end)]
+    
+    for existing_hour, existing_duration in candidates:
         existing_end = existing_hour + existing_duration
         
         # Check if new booking overlaps with existing booking
@@ -132,6 +265,52 @@ def check_availability(db, staff_id, booking_date, start_hour, duration):
     return True
 
 
+@lru_cache(maxsize=512)
+def _parse_date(booking_date):
+    """Parse a YYYY-MM-DD date string (memoized)."""
+    return datetime.strptime(booking_date, '%Y-%m-%d').date()
+
+
+def _date_hours_table():
+    """
+    Get the precomputed date -> opening hours table for the booking horizon.
+    The table is rebuilt the first time it is used on a new day.
+    """
+    global _date_hours, _date_hours_built
+    today = date.today()
+    if _date_hours_built != today:
+        _date_hours = {
+            (today + timedelta(days=offset)).isoformat():
+                OPENING_HOURS.get((today + timedelta(days=offset)).weekday())
+            for offset in range(BOOKING_HORIZON_DAYS)
+        }
+        _date_hours_built = today
+    return _date_hours
+
+
+def parse_booking_date(booking_date):
+    """
+    Parse a booking date once and derive everything the routes need from it.
+    
+    Args:
+        booking_date: Date of booking (YYYY-MM-DD format)
+    
+    Returns:
+        tuple: (is_not_past, opening_hours) where opening_hours is
+        (opening_hour, closing_hour) or None if closed or invalid
+    """
+    try:
+        table = _date_hours_table()
+        if booking_date in table:
+            # The table starts today, so any hit is a bookable date
+            return True, table[booking_date]
+        # Outside the precomputed horizon, fall back to parsing
+        parsed_date = _parse_date(booking_date)
+    except (ValueError, TypeError):
+        return False, None
+    return parsed_date >= date.today(), OPENING_HOURS.get(parsed_date.weekday())
+
+
 def get_opening_hours(booking_date):
     """
     Get opening hours for a specific date.
@@ -142,11 +321,39 @@ def get_opening_hours(booking_date):
     Returns:
         tuple: (opening_hour, closing_hour) or None if closed
     """
-    try:
-        weekday = datetime.strptime(booking_date, '%Y-%m-%d').weekday()
-        return OPENING_HOURS.get(weekday)
-    except (ValueError, TypeError):
-        return None
+    return parse_booking_date(booking_date)[1]
+
+
+@cache.memoize(timeout=60)
+def get_service(service_id):
+    """
+    Get a service's name, price and duration.
+    Cached briefly since the catalog rarely changes between requests.
+    
+    Args:
+        service_id: ID of the service
+    
+    Returns:
+        dict: Service details, or None if not found
+    """
+    row = get_db().execute('SELECT id, name, price, duration FROM services WHERE id = ?',
+                           (service_id,)).fetchone()
+    return dict(row) if row else None
+
+
+@cache.memoize(timeout=60)
+def get_staff_name(staff_id):
+    """
+    Get a staff member's name (cached like get_service).
+    
+    Args:
+        staff_id: ID of the staff member
+    
+    Returns:
+        str: Staff name, or None if not found
+    """
+    row = get_db().execute('SELECT name FROM staff WHERE id = ?', (staff_id,)).fetchone()
+    return row['name'] if row else None
 
 
 # ============================================================================
@@ -160,6 +367,7 @@ def index():
 
 
 @app.route('/api/config')
+@cache.cached(timeout=300)
 def get_config():
     """Get salon configuration (opening hours, etc.)."""
     return jsonify({
@@ -170,6 +378,7 @@ def get_config():
 
 
 @app.route('/api/services', methods=['GET'])
+@cache.cached(timeout=60, query_string=True)
 def get_services():
     """
     Get all available services.
@@ -179,12 +388,17 @@ def get_services():
     """
     db = get_db()
     c = db.cursor()
+    c.row_factory = None  # plain tuples; build the dicts directly
     c.execute('''SELECT id, category, name, price, duration FROM services ORDER BY category, name''')
-    services = [dict(row) for row in c.fetchall()]
+    services = [
+        {'id': r[0], 'category': r[1], 'name': r[2], 'price': r[3], 'duration': r[4]}
+        for r in c.fetchall()
+    ]
     return jsonify(services)
 
 
 @app.route('/api/staff', methods=['GET'])
+@cache.cached(timeout=60, query_string=True)
 def get_staff():
     """
     Get all staff members, optionally filtered by service.
@@ -197,21 +411,20 @@ def get_staff():
     """
     db = get_db()
     c = db.cursor()
+    c.row_factory = None  # plain tuples; build the dicts directly
     service_id = request.args.get('service_id', type=int)
     
     if service_id:
-        # Get staff who can perform this service
-        c.execute('''SELECT s.id, s.name FROM staff s
-                     JOIN staff_services ss ON s.id = ss.staff_id
-                     WHERE ss.service_id = ?''', (service_id,))
-        
-        # If no staff_services mappings exist, return all staff
-        if c.fetchone() is None:
-            c.execute('SELECT id, name FROM staff ORDER BY name')
+        # Get staff who can perform this service, or all staff if no
+        # staff_services mappings exist for it
+        c.execute('''SELECT id, name FROM staff
+                     WHERE id IN (SELECT staff_id FROM staff_services WHERE service_id = :service_id)
+                        OR NOT EXISTS (SELECT 1 FROM staff_services WHERE service_id = :service_id)
+                     ORDER BY name''', {'service_id': service_id})
     else:
         c.execute('SELECT id, name FROM staff ORDER BY name')
     
-    staff = [dict(row) for row in c.fetchall()]
+    staff = [{'id': r[0], 'name': r[1]} for r in c.fetchall()]
     return jsonify(staff)
 
 
@@ -240,8 +453,7 @@ def get_available_slots():
         return jsonify({'error': 'Missing required parameters'}), 400
     
     # Get service duration
-    c.execute('SELECT duration FROM services WHERE id = ?', (service_id,))
-    service = c.fetchone()
+    service = get_service(service_id)
     if not service:
         return jsonify({'error': 'Service not found'}), 404
     
@@ -254,38 +466,29 @@ def get_available_slots():
     
     opening_hour, closing_hour = opening_hours
     
-    # Get existing bookings for this staff member on this date
-    c.execute('''SELECT hour, duration FROM bookings 
-                 WHERE staff_id = ? AND date = ?''', (staff_id, booking_date))
-    bookings = c.fetchall()
-    
-    # Calculate available slots (30-minute intervals)
-    available_slots = []
-    slot_duration = 0.5  # 30-minute slots
-    
-    current_time = opening_hour
+    # Generate 30-minute candidate slots and drop any that overlap an
+    # existing booking, all in a single query
+    c.execute('''WITH RECURSIVE slots(t) AS (
+                     SELECT :open WHERE :open + :duration <= :close
+                     UNION ALL
+                     SELECT t + :step FROM slots WHERE t + :step + :duration <= :close
+                 )
+                 SELECT t FROM slots
+                 WHERE NOT EXISTS (
+                     SELECT 1 FROM bookings b
+                     WHERE b.staff_id = :staff_id AND b.date = :date
+                       AND t < b.hour + b.duration AND t + :duration > b.hour
+                 )
+                 ORDER BY t''', {
+        'open': opening_hour,
+        'close': closing_hour,
+        'step': 0.5,  # 30-minute slots
+        'duration': duration,
+        'staff_id': staff_id,
+        'date': booking_date
+    })
     
-    while current_time + duration <= closing_hour:
-        # Check if this slot conflicts with any existing booking
-        is_available = True
-        slot_end = current_time + duration
-        
-        for booking_hour, booking_duration in bookings:
-            booking_end = booking_hour + booking_duration
-            
-            # Check for overlap
-            if current_time < booking_end and slot_end > booking_hour:
-                is_available = False
-                break
-        
-        if is_available:
-            # Format time as HH:MM
-            hours = int(current_time)
-            minutes = int((current_time - hours) * 60)
-            time_str = f"{hours:02d}:{minutes:02d}"
-            available_slots.append(time_str)
-        
-        current_time += slot_duration
+    available_slots = [SLOT_LABELS[int(t * 2)] for (t,) in c.fetchall()]
     
     return jsonify({
         'date': booking_date,
@@ -315,32 +518,34 @@ def create_booking():
     db = get_db()
     c = db.cursor()
     
-    data = request.get_json()
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Invalid request body'}), 400
     
     # Validate required fields
-    required_fields = ['client_name', 'phone', 'service_id', 'staff_id', 'date', 'hour']
-    for field in required_fields:
-        if not data.get(field):
-            return jsonify({'error': f'Missing required field: {field}'}), 400
+    missing = [field for field in BOOKING_REQUIRED_FIELDS if not data.get(field)]
+    if missing:
+        return jsonify({'error': f"Missing required fields: {', '.join(missing)}"}), 400
     
     # Validate phone format
     if not validate_phone(data['phone']):
         return jsonify({'error': 'Invalid phone number format. Please use South African format (e.g., 0711234567 or +27711234567)'}), 400
     
-    # Validate date is not in the past
-    if not validate_date(data['date']):
+    # Validate date is not in the past and the salon is open
+    is_not_past, opening_hours = parse_booking_date(data['date'])
+    if not is_not_past:
         return jsonify({'error': 'Cannot book appointments in the past'}), 400
     
-    # Validate hour is within opening hours
-    opening_hours = get_opening_hours(data['date'])
     if not opening_hours:
         return jsonify({'error': 'Salon is closed on this date'}), 400
     
-    # Get service duration
-    c.execute('SELECT duration FROM services WHERE id = ?', (data['service_id'],))
-    service = c.fetchone()
+    # Get service and staff details needed for validation and confirmation
+    service = get_service(data['service_id'])
     if not service:
         return jsonify({'error': 'Service not found'}), 400
+    staff_name = get_staff_name(data['staff_id'])
+    if staff_name is None:
+        return jsonify({'error': 'Staff member not found'}), 400
     
     duration = service['duration']
     start_hour = int(data['hour'])
@@ -349,10 +554,6 @@ def create_booking():
     if start_hour + duration > opening_hours[1]:
         return jsonify({'error': 'Selected time does not fit within operating hours'}), 400
     
-    # Check availability (race condition protection)
-    if not check_availability(db, data['staff_id'], data['date'], start_hour, duration):
-        return jsonify({'error': 'Sorry, this time slot is no longer available. Please select another time.'}), 409
-    
     try:
         # Insert booking
         c.execute('''INSERT INTO bookings 
@@ -370,45 +571,57 @@ def create_booking():
         booking_id = c.lastrowid
         db.commit()
         
-        # Get booking details for confirmation
-        c.execute('''SELECT b.*, s.name as service_name, s.price, st.name as staff_name
-                     FROM bookings b
-                     JOIN services s ON b.service_id = s.id
-                     JOIN staff st ON b.staff_id = st.id
-                     WHERE b.id = ?''', (booking_id,))
-        booking = dict(c.fetchone())
-        
-        # Send confirmation SMS (in production, this would be async)
-        try:
-            from sms_utils import send_confirmation_sms
-            send_confirmation_sms(
+        # Send confirmation SMS in the background so the client isn't
+        # kept waiting on the SMS provider
+        if send_confirmation_sms is not None:
+            future = _sms_pool.submit(
+                send_confirmation_sms,
                 phone=data['phone'],
                 client_name=data['client_name'],
-                service_name=booking['service_name'],
-                date=booking['date'],
+                service_name=service['name'],
+                date=data['date'],
                 hour=start_hour,
-                staff_name=booking['staff_name']
+                staff_name=staff_name
             )
-        except ImportError:
+            future.add_done_callback(_log_sms_failure)
+        else:
             # SMS module not available, log for debugging
             app.logger.info(f"SMS confirmation would be sent to {data['phone']}")
         
+        # Queue the 24-hour reminder now rather than waiting for the daily scan.
+        # The booking is already committed, so a scheduling failure is only logged.
+        if schedule_reminder is not None:
+            try:
+                schedule_reminder({
+                    'id': booking_id,
+                    'phone': data['phone'],
+                    'client_name': data['client_name'],
+                    'service_name': service['name'],
+                    'date': _parse_date(data['date']).isoformat(),
+                    'hour': start_hour
+                }, db_path=app.config['DATABASE'])
+            except Exception:
+                app.logger.exception(f"Could not schedule reminder for booking {booking_id}")
+        
         return jsonify({
             'success': True,
             'message': 'Booking confirmed successfully!',
             'booking': {
                 'id': booking_id,
-                'client_name': booking['client_name'],
-                'service_name': booking['service_name'],
-                'date': booking['date'],
+                'client_name': data['client_name'],
+                'service_name': service['name'],
+                'date': data['date'],
                 'hour': f"{start_hour:02d}:00",
-                'staff_name': booking['staff_name'],
-                'price': booking['price']
+                'staff_name': staff_name,
+                'price': service['price']
             }
         })
         
     except sqlite3.IntegrityError as e:
         db.rollback()
+        # Raised by trg_bookings_no_overlap when the slot was taken
+        if 'booking overlap' in str(e):
+            return jsonify({'error': 'Sorry, this time slot is no longer available. Please select another time.'}), 409
         return jsonify({'error': 'Database error. Please try again.'}), 500
 
 
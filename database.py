@@ -6,11 +6,197 @@ This module provides database connection utilities and availability
 calculation logic for the booking system.
 """
 
+import copy
 import sqlite3
-from datetime import datetime, date, timedelta
-from typing import List, Dict, Optional, Tuple
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from datetime import date, timedelta
+from functools import lru_cache, wraps
+from typing import Callable, Iterator, List, Dict, Optional, Set, Tuple
 import os
 
+# Try to import NumPy for vectorized slot calculation (optional dependency)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Slots x bookings below which the plain Python loop beats NumPy; measured
+# break-even is around 500, and a salon day (9-20, half-hour slots, fully
+# booked) stays under it
+NUMPY_MIN_CELLS = 1000
+
+# Reject overlapping bookings for the same staff member at the database
+# level, on insert and when a booking is moved (e.g. by the desktop app),
+# so concurrent writers cannot double-book a slot. Shared with app.py.
+NO_OVERLAP_TRIGGERS_SQL = (
+    '''CREATE TRIGGER IF NOT EXISTS trg_bookings_no_overlap
+       BEFORE INSERT ON bookings
+       WHEN EXISTS (SELECT 1 FROM bookings
+                    WHERE staff_id = NEW.staff_id AND date = NEW.date
+                      AND hour < NEW.hour + NEW.duration
+                      AND hour + duration > NEW.hour)
+       BEGIN
+           SELECT RAISE(ABORT, 'booking overlap');
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_bookings_no_overlap_update
+       BEFORE UPDATE OF staff_id, date, hour, duration ON bookings
+       WHEN EXISTS (SELECT 1 FROM bookings
+                    WHERE id <> NEW.id
+                      AND staff_id = NEW.staff_id AND date = NEW.date
+                      AND hour < NEW.hour + NEW.duration
+                      AND hour + duration > NEW.hour)
+       BEGIN
+           SELECT RAISE(ABORT, 'booking overlap');
+       END''',
+)
+
+
+def cached(key: str, ttl: float = 300) -> Callable:
+    """
+    Cache the result of a DatabaseManager catalog read in memory.
+    Entries expire after ttl seconds or when invalidate_catalog() is called.
+    Callers get a shallow copy, so changing the returned list or dict in
+    place cannot corrupt the cached entry.
+    
+    Args:
+        key: Cache key prefix for the decorated method
+        ttl: Seconds before a cached result is refreshed
+    """
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(self, *args):
+            cache_key = (key,) + args
+            entry = self._cache.get(cache_key)
+            if (entry and entry[0] == self._cache_ver
+                    and time.monotonic() - entry[1] < ttl):
+                return copy.copy(entry[2])
+            version = self._cache_ver
+            result = method(self, *args)
+            self._cache[cache_key] = (version, time.monotonic(), result)
+            return copy.copy(result)
+        return wrapper
+    return decorator
+
+
+@lru_cache(maxsize=128)
+def slot_grid(opening_hour: float, closing_hour: float,
+              service_duration: float) -> Tuple[Tuple[float, str], ...]:
+    """
+    Build the candidate 30-minute slots for a day's opening hours.
+    The grid only depends on the hours and service duration, so it is
+    computed once and reused across requests.
+    
+    Args:
+        opening_hour: Hour the salon opens
+        closing_hour: Hour the salon closes
+        service_duration: Duration of service in hours
+    
+    Returns:
+        Tuple of (start_hour, "HH:MM") pairs for slots that fit before closing
+    """
+    grid = []
+    slot_duration = 0.5  # 30-minute intervals
+    current_time = opening_hour
+    
+    while current_time + service_duration <= closing_hour:
+        # Format as HH:MM
+        hours = int(current_time)
+        minutes = int((current_time - hours) * 60)
+        grid.append((current_time, f"{hours:02d}:{minutes:02d}"))
+        current_time += slot_duration
+    
+    return tuple(grid)
+
+
+class SQLiteConnectionPool:
+    """
+    Thread-safe pool of reusable SQLite connections.
+    Connections are configured once when created and handed out with
+    acquire()/release(), so callers don't pay the open/configure cost
+    on every query.
+    """
+    
+    def __init__(self, db_path: str, max_size: int = 5, timeout: float = 30.0):
+        """
+        Initialize the connection pool.
+        
+        Args:
+            db_path: Path to SQLite database file
+            max_size: Maximum number of open connections
+            timeout: Seconds to wait for a free connection before giving up
+        """
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = deque()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+    
+    def _create_connection(self) -> sqlite3.Connection:
+        """
+        Open and configure a new pooled connection.
+        WAL lets availability reads proceed while a booking is written, and
+        the memory-mapped I/O and larger page cache keep the working set of
+        services/staff/bookings in memory.
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA mmap_size = 67108864")  # 64 MB
+        conn.execute("PRAGMA cache_size = -20000")  # ~20 MB
+        conn.execute("PRAGMA busy_timeout = 5000")
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def acquire(self) -> sqlite3.Connection:
+        """
+        Take a connection from the pool, opening a new one if below max_size.
+        
+        Returns:
+            SQLite connection object
+        
+        Raises:
+            TimeoutError: If no connection becomes free within the timeout
+        """
+        with self._available:
+            while not self._idle and self._created >= self.max_size:
+                if not self._available.wait(self.timeout):
+                    raise TimeoutError("Timed out waiting for a database connection")
+            if self._idle:
+                return self._idle.popleft()
+            self._created += 1
+        
+        try:
+            return self._create_connection()
+        except Exception:
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
+    
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool, discarding any open transaction."""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._available:
+            self._idle.append(conn)
+            self._available.notify()
+    
+    def close_all(self):
+        """Close every idle connection in the pool."""
+        with self._available:
+            while self._idle:
+                self._idle.popleft().close()
+                self._created -= 1
+
 
 class DatabaseManager:
     """
@@ -26,72 +212,110 @@ class DatabaseManager:
             db_path: Path to SQLite database file. Defaults to salon_data.db in current directory.
         """
         self.db_path = db_path or os.getenv('DATABASE_PATH', 'salon_data.db')
-        self.opening_hours = {
-            0: (9, 19),  # Monday
-            1: (9, 19),  # Tuesday
-            2: (9, 19),  # Wednesday
-            3: (9, 19),  # Thursday
-            4: (9, 20),  # Friday
-            5: (9, 20),  # Saturday
-            6: (9, 19),  # Sunday
-        }
+        # Opening hours indexed by weekday (Monday = 0); None means closed
+        self.opening_hours = (
+            (9, 19),  # Monday
+            (9, 19),  # Tuesday
+            (9, 19),  # Wednesday
+            (9, 19),  # Thursday
+            (9, 20),  # Friday
+            (9, 20),  # Saturday
+            (9, 19),  # Sunday
+        )
+        self.pool = SQLiteConnectionPool(self.db_path)
+        
+        # Booked intervals per (staff_id, date), tagged with a version that
+        # create_booking bumps. The TTL bounds staleness from writers outside
+        # this manager (the web app, the desktop app).
+        self.booked_cache_ttl = 5.0
+        self._booked_cache: Dict[Tuple[int, str], Tuple[int, float, List[Tuple[int, int]]]] = {}
+        self._booked_version: Dict[Tuple[int, str], int] = {}
+        
+        # Services/staff/categories rarely change (see the cached decorator)
+        self._cache: Dict[tuple, tuple] = {}
+        self._cache_ver = 0
+    
+    def invalidate_catalog(self):
+        """Drop cached services, staff and categories after they change."""
+        self._cache_ver += 1
+        self._cache.clear()
     
-    def get_connection(self) -> sqlite3.Connection:
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
         """
-        Get a database connection with foreign key support.
+        Borrow a pooled database connection with foreign key support.
         
-        Returns:
-            SQLite connection object
+        Yields:
+            SQLite connection object, returned to the pool on exit
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("PRAGMA foreign_keys = ON")
-        conn.row_factory = sqlite3.Row
-        return conn
+        conn = self.pool.acquire()
+        try:
+            yield conn
+        finally:
+            self.pool.release(conn)
     
-    def close_connection(self, conn: sqlite3.Connection):
-        """Close a database connection."""
-        if conn:
-            conn.close()
+    def ensure_schema(self):
+        """
+        Create the indexes used by the hot availability and listing queries,
+        and the triggers that reject overlapping bookings.
+        Safe to call repeatedly.
+        """
+        with self.connection() as conn:
+            with conn:
+                conn.execute('''CREATE INDEX IF NOT EXISTS idx_bookings_staff_date
+                                ON bookings (staff_id, date, hour, duration)''')
+                conn.execute('''CREATE INDEX IF NOT EXISTS idx_bookings_date_hour
+                                ON bookings (date, hour)''')
+                conn.execute('''CREATE INDEX IF NOT EXISTS idx_services_category
+                                ON services (category, name)''')
+                conn.execute('''CREATE INDEX IF NOT EXISTS idx_staff_services_service
+                                ON staff_services (service_id, staff_id)''')
+                for trigger_sql in NO_OVERLAP_TRIGGERS_SQL:
+                    conn.execute(trigger_sql)
     
     # ========================================================================
     # SERVICE OPERATIONS
     # ========================================================================
     
-    def get_all_services(self) -> List[Dict]:
+    @cached('services')
+    def get_all_services(self) -> List[sqlite3.Row]:
         """
         Get all available services.
         
         Returns:
-            List of service dictionaries with id, category, name, price, duration
-        """
-        conn = self.get_connection()
-        c = conn.cursor()
-        c.execute('''SELECT id, category, name, price, duration 
-                     FROM services 
-                     ORDER BY category, name''')
-        services = [dict(row) for row in c.fetchall()]
-        conn.close()
+            List of service rows with id, category, name, price, duration
+        """
+        with self.connection() as conn:
+            services = conn.execute('''SELECT id, category, name, price, duration 
+                                       FROM services 
+                                       ORDER BY category, name''').fetchall()
         return services
     
-    def get_service_by_id(self, service_id: int) -> Optional[Dict]:
+    def get_service_by_id(self, service_id: int) -> Optional[sqlite3.Row]:
         """
-        Get a service by ID.
+        Get a service by ID, from the cached catalog when possible.
         
         Args:
             service_id: The service ID
         
         Returns:
-            Service dictionary or None if not found
+            Service row or None if not found
         """
-        conn = self.get_connection()
-        c = conn.cursor()
-        c.execute('''SELECT id, category, name, price, duration 
-                     FROM services WHERE id = ?''', (service_id,))
-        row = c.fetchone()
-        conn.close()
-        return dict(row) if row else None
+        service = self._services_by_id().get(service_id)
+        if service is None:
+            # Not cached under this key (e.g. a string ID, or a service added
+            # since the catalog was cached); let SQLite match it
+            with self.connection() as conn:
+                service = conn.execute('''SELECT id, category, name, price, duration 
+                                          FROM services WHERE id = ?''', (service_id,)).fetchone()
+        return service
+    
+    @cached('services_by_id')
+    def _services_by_id(self) -> Dict[int, sqlite3.Row]:
+        """Index the cached service list by ID."""
+        return {service['id']: service for service in self.get_all_services()}
     
-    def get_services_by_category(self, category: str) -> List[Dict]:
+    def get_services_by_category(self, category: str) -> List[sqlite3.Row]:
         """
         Get services filtered by category.
         
@@ -99,17 +323,15 @@ class DatabaseManager:
             category: Service category name
         
         Returns:
-            List of service dictionaries
-        """
-        conn = self.get_connection()
-        c = conn.cursor()
-        c.execute('''SELECT id, category, name, price, duration 
-                     FROM services WHERE category = ? 
-                     ORDER BY name''', (category,))
-        services = [dict(row) for row in c.fetchall()]
-        conn.close()
+            List of service rows
+        """
+        with self.connection() as conn:
+            services = conn.execute('''SELECT id, category, name, price, duration 
+                                       FROM services WHERE category = ? 
+                                       ORDER BY name''', (category,)).fetchall()
         return services
     
+    @cached('categories')
     def get_categories(self) -> List[str]:
         """
         Get all unique service categories.
@@ -117,32 +339,33 @@ class DatabaseManager:
         Returns:
             List of category names
         """
-        conn = self.get_connection()
-        c = conn.cursor()
-        c.execute('SELECT DISTINCT category FROM services ORDER BY category')
-        categories = [row[0] for row in c.fetchall()]
-        conn.close()
+        with self.connection() as conn:
+            rows = conn.execute('SELECT DISTINCT category FROM services ORDER BY category')
+            categories = [row[0] for row in rows]
         return categories
     
     # ========================================================================
     # STAFF OPERATIONS
     # ========================================================================
     
-    def get_all_staff(self) -> List[Dict]:
+    @cached('staff')
+    def get_all_staff(self) -> List[sqlite3.Row]:
         """
         Get all staff members.
         
         Returns:
-            List of staff dictionaries with id and name
+            List of staff rows with id and name
         """
-        conn = self.get_connection()
-        c = conn.cursor()
-        c.execute('SELECT id, name FROM staff ORDER BY name')
-        staff = [dict(row) for row in c.fetchall()]
-        conn.close()
+        with self.connection() as conn:
+            staff = conn.execute('SELECT id, name FROM staff ORDER BY name').fetchall()
         return staff
     
-    def get_staff_by_id(self, staff_id: int) -> Optional[Dict]:
+    @cached('staff_names')
+    def _staff_names(self) -> Dict[int, str]:
+        """Index the cached staff list by ID."""
+        return {member['id']: member['name'] for member in self.get_all_staff()}
+    
+    def get_staff_by_id(self, staff_id: int) -> Optional[sqlite3.Row]:
         """
         Get a staff member by ID.
         
@@ -150,16 +373,13 @@ class DatabaseManager:
             staff_id: The staff ID
         
         Returns:
-            Staff dictionary or None if not found
+            Staff row or None if not found
         """
-        conn = self.get_connection()
-        c = conn.cursor()
-        c.execute('SELECT id, name FROM staff WHERE id = ?', (staff_id,))
-        row = c.fetchone()
-        conn.close()
-        return dict(row) if row else None
+        with self.connection() as conn:
+            row = conn.execute('SELECT id, name FROM staff WHERE id = ?', (staff_id,)).fetchone()
+        return row
     
-    def get_staff_for_service(self, service_id: int) -> List[Dict]:
+    def get_staff_for_service(self, service_id: int) -> List[sqlite3.Row]:
         """
         Get staff members who can perform a specific service.
         
@@ -167,27 +387,15 @@ class DatabaseManager:
             service_id: The service ID
         
         Returns:
-            List of staff dictionaries
-        """
-        conn = self.get_connection()
-        c = conn.cursor()
-        
-        # Check if staff_services mappings exist
-        c.execute('SELECT COUNT(*) FROM staff_services WHERE service_id = ?', (service_id,))
-        has_mappings = c.fetchone()[0] > 0
-        
-        if has_mappings:
-            # Get staff assigned to this service
-            c.execute('''SELECT s.id, s.name FROM staff s
-                         JOIN staff_services ss ON s.id = ss.staff_id
-                         WHERE ss.service_id = ?
-                         ORDER BY s.name''', (service_id,))
-        else:
-            # No mappings, return all staff
-            c.execute('SELECT id, name FROM staff ORDER BY name')
-        
-        staff = [dict(row) for row in c.fetchall()]
-        conn.close()
+            List of staff rows
+        """
+        with self.connection() as conn:
+            # Staff assigned to this service, or all staff if it has no mappings
+            staff = conn.execute('''SELECT s.id, s.name FROM staff s
+                                    WHERE EXISTS (SELECT 1 FROM staff_services
+                                                  WHERE service_id = ?1 AND staff_id = s.id)
+                                       OR NOT EXISTS (SELECT 1 FROM staff_services WHERE service_id = ?1)
+                                    ORDER BY s.name''', (service_id,)).fetchall()
         return staff
     
     # ========================================================================
@@ -204,51 +412,83 @@ class DatabaseManager:
         Returns:
             ID of the newly created booking
         """
-        conn = self.get_connection()
-        c = conn.cursor()
-        
-        c.execute('''INSERT INTO bookings 
-                     (client_name, phone, service_id, staff_id, date, hour, duration, notes) 
-                     VALUES (?, ?, ?, ?, ?, ?, ?, ?)''', (
-            booking_data['client_name'],
-            booking_data['phone'],
-            booking_data['service_id'],
-            booking_data['staff_id'],
-            booking_data['date'],
-            booking_data['hour'],
-            booking_data['duration'],
-            booking_data.get('notes', '')
-        ))
+        return self._insert_booking(booking_data)['id']
+    
+    def create_booking_with_details(self, booking_data: Dict) -> Optional[Dict]:
+        """
+        Create a new booking and return it with service and staff details,
+        matching get_booking_by_id() without a second round trip.
         
-        booking_id = c.lastrowid
-        conn.commit()
-        conn.close()
-        return booking_id
+        Args:
+            booking_data: Dictionary containing booking details
+        
+        Returns:
+            Booking dictionary with service_name, price and staff_name
+        """
+        booking = self._insert_booking(booking_data)
+        service = self._services_by_id().get(booking['service_id'])
+        staff_name = self._staff_names().get(booking['staff_id'])
+        if service is None or staff_name is None:
+            # Catalog cache is stale; fall back to the JOIN
+            row = self.get_booking_by_id(booking['id'])
+            return dict(row) if row else None
+        
+        details = dict(booking)
+        details['service_name'] = service['name']
+        details['price'] = service['price']
+        details['staff_name'] = staff_name
+        return details
     
-    def get_booking_by_id(self, booking_id: int) -> Optional[Dict]:
+    def _insert_booking(self, booking_data: Dict) -> sqlite3.Row:
         """
-        Get booking details by ID.
+        Insert a booking and return the stored row via RETURNING.
         
         Args:
-            booking_id: The booking ID
+            booking_data: Dictionary containing booking details
         
         Returns:
-            Booking dictionary with service and staff details
+            The inserted bookings row
         """
-        conn = self.get_connection()
-        c = conn.cursor()
+        with self.connection() as conn:
+            with conn:
+                booking = conn.execute('''INSERT INTO bookings 
+                                          (client_name, phone, service_id, staff_id, date, hour, duration, notes) 
+                                          VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                                          RETURNING *''', (
+                    booking_data['client_name'],
+                    booking_data['phone'],
+                    booking_data['service_id'],
+                    booking_data['staff_id'],
+                    booking_data['date'],
+                    booking_data['hour'],
+                    booking_data['duration'],
+                    booking_data.get('notes', '')
+                )).fetchone()
         
-        c.execute('''SELECT b.*, s.name as service_name, s.price, st.name as staff_name
-                     FROM bookings b
-                     JOIN services s ON b.service_id = s.id
-                     JOIN staff st ON b.staff_id = st.id
-                     WHERE b.id = ?''', (booking_id,))
+        # Invalidate cached booked slots for this staff member and date
+        key = (booking_data['staff_id'], booking_data['date'])
+        self._booked_version[key] = self._booked_version.get(key, 0) + 1
+        return booking
+    
+    def get_booking_by_id(self, booking_id: int) -> Optional[sqlite3.Row]:
+        """
+        Get booking details by ID.
+        
+        Args:
+            booking_id: The booking ID
         
-        row = c.fetchone()
-        conn.close()
-        return dict(row) if row else None
+        Returns:
+            Booking row with service and staff details
+        """
+        with self.connection() as conn:
+            row = conn.execute('''SELECT b.*, s.name as service_name, s.price, st.name as staff_name
+                                  FROM bookings b
+                                  JOIN services s ON b.service_id = s.id
+                                  JOIN staff st ON b.staff_id = st.id
+                                  WHERE b.id = ?''', (booking_id,)).fetchone()
+        return row
     
-    def get_bookings_for_date(self, booking_date: str) -> List[Dict]:
+    def get_bookings_for_date(self, booking_date: str) -> List[sqlite3.Row]:
         """
         Get all bookings for a specific date.
         
@@ -256,45 +496,126 @@ class DatabaseManager:
             booking_date: Date in YYYY-MM-DD format
         
         Returns:
-            List of booking dictionaries
+            List of booking rows
         """
-        conn = self.get_connection()
-        c = conn.cursor()
+        with self.connection() as conn:
+            bookings = conn.execute('''SELECT b.*, s.name as service_name, st.name as staff_name
+                                       FROM bookings b
+                                       JOIN services s ON b.service_id = s.id
+                                       JOIN staff st ON b.staff_id = st.id
+                                       WHERE b.date = ?
+                                       ORDER BY b.hour''', (booking_date,)).fetchall()
+        return bookings
+    
+    def get_bookings_for_reminder(self, reminder_date: str) -> List[sqlite3.Row]:
+        """
+        Get all bookings for a specific date (used for reminders).
         
-        c.execute('''SELECT b.*, s.name as service_name, st.name as staff_name
-                     FROM bookings b
-                     JOIN services s ON b.service_id = s.id
-                     JOIN staff st ON b.staff_id = st.id
-                     WHERE b.date = ?
-                     ORDER BY b.hour''', (booking_date,))
+        Args:
+            reminder_date: Date in YYYY-MM-DD format
         
-        bookings = [dict(row) for row in c.fetchall()]
-        conn.close()
+        Returns:
+            List of booking rows with client contact info
+        """
+        with self.connection() as conn:
+            bookings = conn.execute('''SELECT b.id, b.client_name, b.phone, b.date, b.hour, 
+                                              s.name as service_name, st.name as staff_name
+                                       FROM bookings b
+                                       JOIN services s ON b.service_id = s.id
+                                       JOIN staff st ON b.staff_id = st.id
+                                       WHERE b.date = ?''', (reminder_date,)).fetchall()
         return bookings
     
-    def get_bookings_for_reminder(self, reminder_date: str) -> List[Dict]:
+    # ========================================================================
+    # REMINDER OPERATIONS
+    # ========================================================================
+    
+    def ensure_reminder_log(self):
         """
-        Get all bookings for a specific date (used for reminders).
+        Create the tables recording which reminders have been sent and how
+        many SMS each client has been sent per day, dropping counts from
+        earlier days. Safe to call repeatedly.
+        """
+        with self.connection() as conn:
+            with conn:
+                conn.execute('''CREATE TABLE IF NOT EXISTS sent_reminders
+                                (booking_id INTEGER, reminder_date TEXT,
+                                 PRIMARY KEY(booking_id, reminder_date))''')
+                conn.execute('''CREATE TABLE IF NOT EXISTS sms_daily_counts
+                                (phone TEXT, day TEXT, count INTEGER,
+                                 PRIMARY KEY(phone, day))''')
+                conn.execute('DELETE FROM sms_daily_counts WHERE day < ?',
+                             (date.today().isoformat(),))
+    
+    def get_sent_reminders(self, reminder_date: str) -> Set[int]:
+        """
+        Get the bookings already reminded about for a date.
         
         Args:
             reminder_date: Date in YYYY-MM-DD format
         
         Returns:
-            List of booking dictionaries with client contact info
+            Set of booking IDs
         """
-        conn = self.get_connection()
-        c = conn.cursor()
+        with self.connection() as conn:
+            rows = conn.execute('SELECT booking_id FROM sent_reminders WHERE reminder_date = ?',
+                                (reminder_date,))
+            sent = {row[0] for row in rows}
+        return sent
+    
+    def claim_reminder(self, booking_id: int, reminder_date: str) -> bool:
+        """
+        Record a booking's reminder as sent before sending it, so that only
+        one sender (the daily batch or a job queued at booking time) sends it.
         
-        c.execute('''SELECT b.id, b.client_name, b.phone, b.date, b.hour, 
-                            s.name as service_name, st.name as staff_name
-                     FROM bookings b
-                     JOIN services s ON b.service_id = s.id
-                     JOIN staff st ON b.staff_id = st.id
-                     WHERE b.date = ?''', (reminder_date,))
+        Args:
+            booking_id: The booking ID
+            reminder_date: Date in YYYY-MM-DD format
         
-        bookings = [dict(row) for row in c.fetchall()]
-        conn.close()
-        return bookings
+        Returns:
+            True if this caller claimed the reminder and should send it,
+            False if it was already claimed
+        """
+        with self.connection() as conn:
+            with conn:
+                cursor = conn.execute('INSERT OR IGNORE INTO sent_reminders (booking_id, reminder_date) VALUES (?, ?)',
+                                      (booking_id, reminder_date))
+        return cursor.rowcount == 1
+    
+    def release_reminder(self, booking_id: int, reminder_date: str):
+        """
+        Drop a claim from claim_reminder() whose send did not go out, so the
+        reminder can be retried.
+        
+        Args:
+            booking_id: The booking ID
+            reminder_date: Date in YYYY-MM-DD format
+        """
+        with self.connection() as conn:
+            with conn:
+                conn.execute('DELETE FROM sent_reminders WHERE booking_id = ? AND reminder_date = ?',
+                             (booking_id, reminder_date))
+    
+    def take_sms_quota(self, phone: str, day: str, limit: int) -> bool:
+        """
+        Count an SMS against a client's daily limit. The count lives in the
+        database, so every web worker and the reminder daemon share one cap.
+        
+        Args:
+            phone: E.164 formatted phone number
+            day: Date in YYYY-MM-DD format
+            limit: Messages allowed per client per day
+        
+        Returns:
+            True if the message may be sent, False if the limit is reached
+        """
+        with self.connection() as conn:
+            with conn:
+                row = conn.execute('''INSERT INTO sms_daily_counts (phone, day, count) VALUES (?, ?, 1)
+                                      ON CONFLICT (phone, day) DO UPDATE SET count = count + 1
+                                      WHERE count < ?
+                                      RETURNING count''', (phone, day, limit)).fetchone()
+        return row is not None and row[0] <= limit
     
     # ========================================================================
     # AVAILABILITY CALCULATIONS
@@ -311,8 +632,12 @@ class DatabaseManager:
             Tuple of (opening_hour, closing_hour) or None if closed
         """
         try:
-            weekday = datetime.strptime(booking_date, '%Y-%m-%d').weekday()
-            return self.opening_hours.get(weekday)
+            # Parse the fixed-width fields directly; much cheaper than strptime
+            if len(booking_date) != 10 or booking_date[4] != '-' or booking_date[7] != '-':
+                return None
+            weekday = date(int(booking_date[0:4]), int(booking_date[5:7]),
+                           int(booking_date[8:10])).weekday()
+            return self.opening_hours[weekday]
         except (ValueError, TypeError):
             return None
     
@@ -339,15 +664,34 @@ class DatabaseManager:
         Returns:
             List of tuples (start_hour, duration) for each booking
         """
-        conn = self.get_connection()
-        c = conn.cursor()
+        cached = self._get_cached_booked_slots(staff_id, booking_date)
+        if cached is not None:
+            return cached
         
-        c.execute('''SELECT hour, duration FROM bookings 
-                     WHERE staff_id = ? AND date = ?''', (staff_id, booking_date))
+        key = (staff_id, booking_date)
+        version = self._booked_version.get(key, 0)
+        with self.connection() as conn:
+            rows = conn.execute('''SELECT hour, duration FROM bookings 
+                                   WHERE staff_id = ? AND date = ?''', (staff_id, booking_date))
+            slots = [(row['hour'], row['duration']) for row in rows]
         
-        slots = [(row['hour'], row['duration']) for row in c.fetchall()]
-        conn.close()
-        return slots
+        self._booked_cache[key] = (version, time.monotonic(), slots)
+        return list(slots)
+    
+    def _get_cached_booked_slots(self, staff_id: int,
+                                 booking_date: str) -> Optional[List[Tuple[int, int]]]:
+        """
+        Get booked slots from the in-memory cache without querying.
+        
+        Returns:
+            List of (start_hour, duration) tuples, or None if not cached or stale
+        """
+        key = (staff_id, booking_date)
+        cached = self._booked_cache.get(key)
+        if (cached and cached[0] == self._booked_version.get(key, 0)
+                and time.monotonic() - cached[1] < self.booked_cache_ttl):
+            return list(cached[2])
+        return None
     
     def is_slot_available(self, staff_id: int, booking_date: str, 
                           start_hour: float, duration: int) -> bool:
@@ -363,17 +707,30 @@ class DatabaseManager:
         Returns:
             True if slot is available, False if booked
         """
-        booked_slots = self.get_booked_slots(staff_id, booking_date)
-        slot_end = start_hour + duration
+        # Always ask the database, since the booked-slot cache can miss
+        # recent writes; SQLite stops at the first overlap via the index
+        with self.connection() as conn:
+            conflict = conn.execute('''SELECT EXISTS (
+                                           SELECT 1 FROM bookings
+                                           WHERE staff_id = ? AND date = ?
+                                             AND hour < ? AND hour + duration > ?
+                                       )''', (staff_id, booking_date, start_hour + duration, start_hour)).fetchone()[0]
+        return not conflict
+    
+    @staticmethod
+    def _sorted_intervals(booked_slots: List[Tuple[int, int]]) -> Tuple[List[Tuple[float, float]], List[float]]:
+        """
+        Convert booked slots to (start, end) intervals sorted by start.
         
-        for booked_hour, booked_duration in booked_slots:
-            booked_end = booked_hour + booked_duration
-            
-            # Check for overlap
-            if start_hour < booked_end and slot_end > booked_hour:
-                return False
+        Args:
+            booked_slots: List of (start_hour, duration) tuples
         
-        return True
+        Returns:
+            Tuple of (intervals, starts) where starts lists each interval's
+            start hour, for use with bisect
+        """
+        intervals = sorted((hour, hour + duration) for hour, duration in booked_slots)
+        return intervals, [start for start, _ in intervals]
     
     def calculate_available_slots(self, staff_id: int, booking_date: str, 
                                    service_duration: int) -> List[str]:
@@ -395,37 +752,133 @@ class DatabaseManager:
         
         opening_hour, closing_hour = opening_hours
         
-        # Get booked slots
-        booked_slots = self.get_booked_slots(staff_id, booking_date)
+        # Candidate 30-minute slots with their HH:MM labels
+        grid = slot_grid(opening_hour, closing_hour, service_duration)
         
-        # Calculate available slots in 30-minute intervals
-        available_slots = []
-        slot_duration = 0.5  # 30-minute intervals
-        current_time = opening_hour
+        # Reuse booked slots already in memory; otherwise let SQLite work out
+        # the free slots in a single query
+        booked_slots = self._get_cached_booked_slots(staff_id, booking_date)
+        if booked_slots is None:
+            return self._calculate_available_slots_sql(
+                staff_id, booking_date, opening_hour, closing_hour, service_duration, grid
+            )
         
-        while current_time + service_duration <= closing_hour:
-            # Check if this slot conflicts with any booking
+        return self._free_slots(grid, service_duration, booked_slots)
+    
+    def _calculate_available_slots_sql(self, staff_id: int, booking_date: str,
+                                       opening_hour: int, closing_hour: int,
+                                       service_duration: float,
+                                       grid: Tuple[Tuple[float, str], ...]) -> List[str]:
+        """
+        Compute free slots inside SQLite.
+        A recursive CTE generates the 30-minute candidates and NOT EXISTS
+        drops any that overlap a booking, using idx_bookings_staff_date.
+        
+        Args:
+            staff_id: Staff member ID
+            booking_date: Date in YYYY-MM-DD format
+            opening_hour: Hour the salon opens
+            closing_hour: Hour the salon closes
+            service_duration: Duration of service in hours
+            grid: Candidate (start_hour, "HH:MM") pairs from slot_grid, used for labels
+        
+        Returns:
+            List of available time strings (e.g., ['09:00', '09:30', ...])
+        """
+        with self.connection() as conn:
+            rows = conn.execute('''WITH RECURSIVE slots(t) AS (
+                                       SELECT :open WHERE :open + :duration <= :close
+                                       UNION ALL
+                                       SELECT t + 0.5 FROM slots WHERE t + 0.5 + :duration <= :close
+                                   )
+                                   SELECT t FROM slots
+                                   WHERE NOT EXISTS (
+                                       SELECT 1 FROM bookings b
+                                       WHERE b.staff_id = :staff_id AND b.date = :date
+                                         AND t < b.hour + b.duration AND t + :duration > b.hour
+                                   )
+                                   ORDER BY t''', {
+                'open': opening_hour,
+                'close': closing_hour,
+                'duration': service_duration,
+                'staff_id': staff_id,
+                'date': booking_date
+            })
+            free_starts = [row[0] for row in rows]
+        
+        labels = dict(grid)
+        return [labels[start] for start in free_starts]
+    
+    def _free_slots(self, grid: Tuple[Tuple[float, str], ...], service_duration: float,
+                    booked_slots: List[Tuple[int, int]]) -> List[str]:
+        """
+        Filter candidate slots against booked slots already in memory.
+        
+        Args:
+            grid: Candidate (start_hour, "HH:MM") pairs from slot_grid
+            service_duration: Duration of service in hours
+            booked_slots: List of (start_hour, duration) tuples
+        
+        Returns:
+            List of available time strings (e.g., ['09:00', '09:30', ...])
+        """
+        if NUMPY_AVAILABLE and len(grid) * len(booked_slots) >= NUMPY_MIN_CELLS:
+            return self._calculate_available_slots_vectorized(
+                grid, service_duration, booked_slots
+            )
+        
+        # Calculate booking end times once, sorted by start
+        intervals, starts = self._sorted_intervals(booked_slots)
+        
+        available_slots = []
+        for current_time, time_str in grid:
+            # Check if this slot conflicts with any booking that starts
+            # before the slot ends
             is_available = True
             slot_end = current_time + service_duration
             
-            for booked_hour, booked_duration in booked_slots:
-                booked_end = booked_hour + booked_duration
-                
-                if current_time < booked_end and slot_end > booked_hour:
+            for booked_hour, booked_end in intervals[:bisect_left(starts, slot_end)]:
+                if current_time < booked_end:
                     is_available = False
                     break
             
             if is_available:
-                # Format as HH:MM
-                hours = int(current_time)
-                minutes = int((current_time - hours) * 60)
-                time_str = f"{hours:02d}:{minutes:02d}"
                 available_slots.append(time_str)
-            
-            current_time += slot_duration
         
         return available_slots
     
+    def _calculate_available_slots_vectorized(self, grid: Tuple[Tuple[float, str], ...],
+                                              service_duration: float,
+                                              booked_slots: List[Tuple[int, int]]) -> List[str]:
+        """
+        NumPy version of the slot loop in calculate_available_slots.
+        Tests every candidate slot against every booking in one broadcast
+        comparison instead of a nested Python loop.
+        
+        Args:
+            grid: Candidate (start_hour, "HH:MM") pairs from slot_grid
+            service_duration: Duration of service in hours
+            booked_slots: List of (start_hour, duration) tuples
+        
+        Returns:
+            List of available time strings (e.g., ['09:00', '09:30', ...])
+        """
+        if not grid:
+            return []
+        
+        starts = np.array([start for start, _ in grid])
+        
+        booked = np.array(booked_slots, dtype=float)
+        booked_starts = booked[:, 0]
+        booked_ends = booked_starts + booked[:, 1]
+        
+        # Overlap occurs if: slot_start < booked_end AND slot_end > booked_start
+        conflicts = ((starts[:, None] < booked_ends[None, :]) &
+                     ((starts + service_duration)[:, None] > booked_starts[None, :]))
+        free = (~conflicts.any(axis=1)).tolist()
+        
+        return [time_str for (_, time_str), is_free in zip(grid, free) if is_free]
+    
     def get_available_slots_filtered(self, staff_id: int, booking_date: str, 
                                       service_id: int) -> Dict:
         """
@@ -462,10 +915,79 @@ class DatabaseManager:
         return {
             'date': booking_date,
             'staff_id': staff_id,
-            'service': service,
+            'service': dict(service),
             'opening_hours': opening_hours,
             'slots': slots
         }
+    
+    def check_availability_batch(self, queries: List[Tuple[int, str, int]]) -> List[Dict]:
+        """
+        Get available slots for many (staff, date, service) combinations at once.
+        Bookings for every distinct staff/date pair are fetched in a single
+        query, then slots are computed in memory for each combination.
+        
+        Args:
+            queries: List of (staff_id, booking_date, service_id) tuples
+        
+        Returns:
+            List of dictionaries in the same order and format as
+            get_available_slots_filtered
+        """
+        # Fetch bookings for all open staff/date pairs in one round trip
+        keys = list(dict.fromkeys(
+            (staff_id, booking_date) for staff_id, booking_date, _ in queries
+            if self.get_opening_hours(booking_date)
+        ))
+        booked_by_key: Dict[Tuple[int, str], List[Tuple[int, int]]] = {key: [] for key in keys}
+        
+        if keys:
+            versions = {key: self._booked_version.get(key, 0) for key in keys}
+            placeholders = ', '.join(['(?, ?)'] * len(keys))
+            params = [value for key in keys for value in key]
+            
+            with self.connection() as conn:
+                rows = conn.execute(f'''SELECT staff_id, date, hour, duration FROM bookings
+                                        WHERE (staff_id, date) IN (VALUES {placeholders})''', params)
+                for row in rows:
+                    booked_by_key[(row['staff_id'], row['date'])].append((row['hour'], row['duration']))
+            
+            # Share the fetched bookings with later single lookups
+            fetched_at = time.monotonic()
+            for key in keys:
+                self._booked_cache[key] = (versions[key], fetched_at, booked_by_key[key])
+        
+        results = []
+        for staff_id, booking_date, service_id in queries:
+            service = self.get_service_by_id(service_id)
+            
+            if not service:
+                results.append({'error': 'Service not found', 'slots': []})
+                continue
+            
+            opening_hours = self.get_opening_hours(booking_date)
+            
+            if not opening_hours:
+                results.append({
+                    'error': 'Salon is closed on this date',
+                    'slots': [],
+                    'closed': True
+                })
+                continue
+            
+            opening_hour, closing_hour = opening_hours
+            grid = slot_grid(opening_hour, closing_hour, service['duration'])
+            slots = self._free_slots(grid, service['duration'],
+                                     booked_by_key[(staff_id, booking_date)])
+            
+            results.append({
+                'date': booking_date,
+                'staff_id': staff_id,
+                'service': dict(service),
+                'opening_hours': opening_hours,
+                'slots': slots
+            })
+        
+        return results
 
 
 # ========================================================================
@@ -481,107 +1003,109 @@ def init_sample_data(db_path: str = None):
         db_path: Path to database file
     """
     db = DatabaseManager(db_path)
-    conn = db.get_connection()
-    c = conn.cursor()
-    
-    # Check if services exist
-    c.execute('SELECT COUNT(*) FROM services')
-    if c.fetchone()[0] == 0:
-        # All services from Belle Madame Salon menu
-        services = [
-            # GEL NAILS
-            ('GEL NAILS', 'Lola Lee Gel Overlays', 250, 1),
-            ('GEL NAILS', 'Lola Lee Gel Overlays Toes', 185, 1),
-            ('GEL NAILS', 'Gel Tips', 285, 1.5),
-            ('GEL NAILS', 'Gel Soft Tips', 300, 1.5),
-            
-            # ACRYLIC NAILS
-            ('ACRYLIC NAILS', 'Acrylic Overlays', 280, 1),
-            ('ACRYLIC NAILS', 'Acrylic Toes Overlays', 200, 1),
-            ('ACRYLIC NAILS', 'Acrylic Tips', 320, 1.5),
-            
-            # NAIL ART
-            ('NAIL ART', 'Stickers (Per Nail)', 10, 0.1),
-            ('NAIL ART', 'Free Hand Art (Per Nail)', 25, 0.15),
-            ('NAIL ART', 'Add French', 50, 0.1),
-            ('NAIL ART', 'Soak Off', 50, 0.25),
-            
-            # PEDICURES
-            ('PEDICURES', 'Basic Pedicure (30 min)', 150, 0.5),
-            ('PEDICURES', 'Basic Pedi + Gel Paint', 250, 0.75),
-            ('PEDICURES', 'Spa Pedicure (45 min)', 250, 0.75),
-            ('PEDICURES', 'Spa Pedi + Gel Paint', 350, 1),
-            ('PEDICURES', 'Deluxe Pedicure (1 hour)', 350, 1),
-            ('PEDICURES', 'Deluxe Pedi + Gel Paint', 450, 1.25),
-            
-            # WEEKDAY SPECIALS
-            ('WEEKDAY SPECIALS', 'Wash + Set (Weekend)', 159, 0.5),
-            ('WEEKDAY SPECIALS', 'Wash Set + Treat (Weekday)', 220, 0.75),
-            ('WEEKDAY SPECIALS', 'Pensioners (Mon-Thurs)', 139, 0.5),
-            
-            # WASH & SET
-            ('WASH & SET', 'Wash & Set (Very Short/Side)', 159, 0.5),
-            ('WASH & SET', 'Wash & Set (Short up to Bob)', 179, 0.5),
-            ('WASH & SET', 'Wash & Set (Med to Mid Back)', 199, 0.75),
-            ('WASH & SET', 'Wash & Set + Curls (Long)', 250, 1),
-            
-            # TREATMENTS
-            ('TREATMENTS', 'Karseell', 125, 0.5),
-            ('TREATMENTS', 'Botox (Non Chemical)', 110, 0.5),
-            ('TREATMENTS', 'Kadus', 150, 0.5),
-            
-            # CHEMICALS
-            ('CHEMICALS', 'Chemical Botox Wash & Set', 500, 2.5),
-            ('CHEMICALS', 'Root Colour, Wash + Set', 350, 2),
-            ('CHEMICALS', 'Add Treatment', 100, 0.5),
-            ('CHEMICALS', 'Full Colour', 400, 2),
-            ('CHEMICALS', 'Foils (Per Foil)', 20, 0.1),
-            ('CHEMICALS', 'Toning', 100, 0.75),
-            
-            # CUTS
-            ('CUTS', 'Trim up to 2cm', 50, 0.25),
-            ('CUTS', 'Styled Cuts (incl Wash + Set)', 300, 1),
-            ('CUTS', 'Long Cuts (incl Wash + Set)', 350, 1.25),
-            
-            # LASHES
-            ('LASHES', 'Individuals', 350, 1.5),
-            ('LASHES', 'Clusters', 200, 1),
-            
-            # MANICURES
-            ('MANICURES', 'Manicure', 200, 0.5),
-            ('MANICURES', 'Nail Prep, Buff & Shine', 100, 0.25),
+    db.ensure_schema()
+    with db.connection() as conn:
+        # Check if services exist
+        if conn.execute('SELECT COUNT(*) FROM services').fetchone()[0] == 0:
+            # All services from Belle Madame Salon menu
+            services = [
+                # GEL NAILS
+                ('GEL NAILS', 'Lola Lee Gel Overlays', 250, 1),
+                ('GEL NAILS', 'Lola Lee Gel Overlays Toes', 185, 1),
+                ('GEL NAILS', 'Gel Tips', 285, 1.5),
+                ('GEL NAILS', 'Gel Soft Tips', 300, 1.5),
+                
+                # ACRYLIC NAILS
+                ('ACRYLIC NAILS', 'Acrylic Overlays', 280, 1),
+                ('ACRYLIC NAILS', 'Acrylic Toes Overlays', 200, 1),
+                ('ACRYLIC NAILS', 'Acrylic Tips', 320, 1.5),
+                
+                # NAIL ART
+                ('NAIL ART', 'Stickers (Per Nail)', 10, 0.1),
+                ('NAIL ART', 'Free Hand Art (Per Nail)', 25, 0.15),
+                ('NAIL ART', 'Add French', 50, 0.1),
+                ('NAIL ART', 'Soak Off', 50, 0.25),
+                
+                # PEDICURES
+                ('PEDICURES', 'Basic Pedicure (30 min)', 150, 0.5),
+                ('PEDICURES', 'Basic Pedi + Gel Paint', 250, 0.75),
+                ('PEDICURES', 'Spa Pedicure (45 min)', 250, 0.75),
+                ('PEDICURES', 'Spa Pedi + Gel Paint', 350, 1),
+                ('PEDICURES', 'Deluxe Pedicure (1 hour)', 350, 1),
+                ('PEDICURES', 'Deluxe Pedi + Gel Paint', 450, 1.25),
+                
+                # WEEKDAY SPECIALS
+                ('WEEKDAY SPECIALS', 'Wash + Set (Weekend)', 159, 0.5),
+                ('WEEKDAY SPECIALS', 'Wash Set + Treat (Weekday)', 220, 0.75),
+                ('WEEKDAY SPECIALS', 'Pensioners (Mon-Thurs)', 139, 0.5),
+                
+                # WASH & SET
+                ('WASH & SET', 'Wash & Set (Very Short/Side)', 159, 0.5),
+                ('WASH & SET', 'Wash & Set (Short up to Bob)', 179, 0.5),
+                ('WASH & SET', 'Wash & Set (Med to Mid Back)', 199, 0.75),
+                ('WASH & SET', 'Wash & Set + Curls (Long)', 250, 1),
+                
+                # TREATMENTS
+                ('TREATMENTS', 'Karseell', 125, 0.5),
+                ('TREATMENTS', 'Botox (Non Chemical)', 110, 0.5),
+                ('TREATMENTS', 'Kadus', 150, 0.5),
+                
+                # CHEMICALS
+                ('CHEMICALS', 'Chemical Botox Wash & Set', 500, 2.5),
+                ('CHEMICALS', 'Root Colour, Wash + Set', 350, 2),
+                ('CHEMICALS', 'Add Treatment', 100, 0.5),
+                ('CHEMICALS', 'Full Colour', 400, 2),
+                ('CHEMICALS', 'Foils (Per Foil)', 20, 0.1),
+                ('CHEMICALS', 'Toning', 100, 0.75),
+                
+                # CUTS
+                ('CUTS', 'Trim up to 2cm', 50, 0.25),
+                ('CUTS', 'Styled Cuts (incl Wash + Set)', 300, 1),
+                ('CUTS', 'Long Cuts (incl Wash + Set)', 350, 1.25),
+                
+                # LASHES
+                ('LASHES', 'Individuals', 350, 1.5),
+                ('LASHES', 'Clusters', 200, 1),
+                
+                # MANICURES
+                ('MANICURES', 'Manicure', 200, 0.5),
+                ('MANICURES', 'Nail Prep, Buff & Shine', 100, 0.25),
+                
+                # FACIALS
+                ('FACIALS', 'Deep Cleansing Facial (45 min)', 350, 0.75),
+                ('FACIALS', 'Dermaplaning Facial (45 min)', 400, 0.75),
+                
+                # WAXING
+                ('WAXING', 'Eyebrows', 60, 0.15),
+                ('WAXING', 'Eyebrow Wax & Tint', 100, 0.25),
+                ('WAXING', 'Upper Lip & Chin', 60, 0.15),
+                ('WAXING', 'Full Face', 200, 0.5),
+                ('WAXING', 'Underarms', 90, 0.25),
+                ('WAXING', 'Full Legs', 150, 0.5),
+                ('WAXING', 'Half Legs', 100, 0.35),
+                ('WAXING', 'Full Arm', 100, 0.35),
+                ('WAXING', 'Half Arm', 75, 0.25),
+                ('WAXING', 'Hollywood', 500, 0.75),
+                ('WAXING', 'Brazilian', 350, 0.5),
+                ('WAXING', 'Bikini', 200, 0.35),
+                ('WAXING', 'Vajacial (excl. wax)', 450, 0.75),
+            ]
             
-            # FACIALS
-            ('FACIALS', 'Deep Cleansing Facial (45 min)', 350, 0.75),
-            ('FACIALS', 'Dermaplaning Facial (45 min)', 400, 0.75),
+            # Seed everything in one transaction (a single commit/fsync), using
+            # one multi-row INSERT per table so each compiles and runs once
+            with conn:
+                conn.execute('BEGIN IMMEDIATE')
+                placeholders = ', '.join(['(?, ?, ?, ?)'] * len(services))
+                conn.execute(f'INSERT INTO services (category, name, price, duration) VALUES {placeholders}',
+                             [value for service in services for value in service])
+                
+                # Add sample staff
+                staff_members = ['Sarah', 'Emma', 'Lisa', 'Nadia']
+                placeholders = ', '.join(['(?)'] * len(staff_members))
+                conn.execute(f'INSERT INTO staff (name) VALUES {placeholders}', staff_members)
             
-            # WAXING
-            ('WAXING', 'Eyebrows', 60, 0.15),
-            ('WAXING', 'Eyebrow Wax & Tint', 100, 0.25),
-            ('WAXING', 'Upper Lip & Chin', 60, 0.15),
-            ('WAXING', 'Full Face', 200, 0.5),
-            ('WAXING', 'Underarms', 90, 0.25),
-            ('WAXING', 'Full Legs', 150, 0.5),
-            ('WAXING', 'Half Legs', 100, 0.35),
-            ('WAXING', 'Full Arm', 100, 0.35),
-            ('WAXING', 'Half Arm', 75, 0.25),
-            ('WAXING', 'Hollywood', 500, 0.75),
-            ('WAXING', 'Brazilian', 350, 0.5),
-            ('WAXING', 'Bikini', 200, 0.35),
-            ('WAXING', 'Vajacial (excl. wax)', 450, 0.75),
-        ]
-        
-        c.executemany('INSERT INTO services (category, name, price, duration) VALUES (?, ?, ?, ?)', services)
-        
-        # Add sample staff
-        staff_members = ['Sarah', 'Emma', 'Lisa', 'Nadia']
-        for name in staff_members:
-            c.execute('INSERT INTO staff (name) VALUES (?)', (name,))
-        
-        conn.commit()
-        print("Sample data initialized successfully with all salon services")
-    
-    conn.close()
+            db.invalidate_catalog()
+            print("Sample data initialized successfully with all salon services")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,22 @@
+"""
+Belle Madame Salon Online Booking System
+Gunicorn Configuration
+
+Usage: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import multiprocessing
+import os
+
+# Bind to the port provided by the hosting platform
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Import the app once in the master and fork workers from it, so the
+# loaded modules are shared copy-on-write instead of re-imported per worker.
+# Nothing in app.py opens connections or starts threads at import time.
+preload_app = True
+
+# Threaded workers: requests mostly wait on SQLite and the SMS provider
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = 4
@@ -7,6 +7,36 @@ CREATE TABLE IF NOT EXISTS staff (id INTEGER PRIMARY KEY, name TEXT);
 CREATE TABLE IF NOT EXISTS services (id INTEGER PRIMARY KEY, category TEXT, name TEXT, price REAL, duration INTEGER);
 CREATE TABLE IF NOT EXISTS bookings (id INTEGER PRIMARY KEY, client_name TEXT, phone TEXT, service_id INTEGER, staff_id INTEGER, date TEXT, hour INTEGER, duration INTEGER, notes TEXT, created_at TEXT DEFAULT CURRENT_TIMESTAMP);
 CREATE TABLE IF NOT EXISTS staff_services (staff_id INTEGER, service_id INTEGER, PRIMARY KEY(staff_id, service_id));
+CREATE TABLE IF NOT EXISTS sent_reminders (booking_id INTEGER, reminder_date TEXT, PRIMARY KEY(booking_id, reminder_date));
+CREATE TABLE IF NOT EXISTS sms_daily_counts (phone TEXT, day TEXT, count INTEGER, PRIMARY KEY(phone, day));
+
+-- Create indexes
+CREATE INDEX IF NOT EXISTS idx_bookings_staff_date ON bookings (staff_id, date, hour, duration);
+CREATE INDEX IF NOT EXISTS idx_bookings_date_hour ON bookings (date, hour);
+CREATE INDEX IF NOT EXISTS idx_services_category ON services (category, name);
+CREATE INDEX IF NOT EXISTS idx_staff_services_service ON staff_services (service_id, staff_id);
+
+-- Reject overlapping bookings for the same staff member
+CREATE TRIGGER IF NOT EXISTS trg_bookings_no_overlap
+BEFORE INSERT ON bookings
+WHEN EXISTS (SELECT 1 FROM bookings
+             WHERE staff_id = NEW.staff_id AND date = NEW.date
+               AND hour < NEW.hour + NEW.duration
+               AND hour + duration > NEW.hour)
+BEGIN
+    SELECT RAISE(ABORT, 'booking overlap');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_bookings_no_overlap_update
+BEFORE UPDATE OF staff_id, date, hour, duration ON bookings
+WHEN EXISTS (SELECT 1 FROM bookings
+             WHERE id <> NEW.id
+               AND staff_id = NEW.staff_id AND date = NEW.date
+               AND hour < NEW.hour + NEW.duration
+               AND hour + duration > NEW.hour)
+BEGIN
+    SELECT RAISE(ABORT, 'booking overlap');
+END;
 
 -- Add staff members
 INSERT OR IGNORE INTO staff (id, name) VALUES
@@ -6,26 +6,100 @@ This module handles automated SMS reminders for upcoming appointments.
 It can be run as a standalone script or scheduled via cron/task scheduler.
 """
 
+import asyncio
+import importlib.util
+import json
 import os
+import random
+import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, date, timedelta
-from typing import List, Dict
-from dotenv import load_dotenv
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Dict, Tuple
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if TYPE_CHECKING:
+    import httpx
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from database import DatabaseManager
+
+# Optional dependencies are only located here and imported where used,
+# so importing this module (e.g. from app.py) stays cheap
+TWILIO_AVAILABLE = importlib.util.find_spec('twilio') is not None
+
+APSCHEDULER_AVAILABLE = importlib.util.find_spec('apscheduler') is not None
+HTTPX_AVAILABLE = importlib.util.find_spec('httpx') is not None
+
+# Everything except digits and '+', stripped from phone numbers
+NON_E164_RE = re.compile(r'[^\d+]')
+
+# "HH:00" labels indexed by start hour
+_HOUR_STR = tuple(f"{h:02d}:00" for h in range(24))
+
+# One-off reminder jobs queued at booking time (see _get_reminder_scheduler)
+_reminder_scheduler = None
+_reminder_scheduler_lock = threading.Lock()
+
+# Result for a reminder another sender has already claimed
+_ALREADY_SENT = {'success': True, 'skipped': True, 'message': 'Reminder already sent'}
+
+# Separator line for console reports
+_BANNER = '=' * 60
+
+# Twilio "too many requests" error, retried with backoff like HTTP 429;
+# other errors (e.g. 21612 unroutable number) are permanent
+RETRYABLE_TWILIO_CODES = {20429}
+SMS_MAX_ATTEMPTS = 5
+
+# Recipients per Notify request, keeping requests well under the size limit
+NOTIFY_MAX_BINDINGS = 1000
+
+# Twilio REST endpoint used by the async send path
+TWILIO_MESSAGES_URL = 'https://api.twilio.com/2010-04-01/Accounts/{sid}/Messages.json'
+
+
+def _backoff_delay(attempt: int) -> float:
+    """
+    Seconds to wait before retrying a rate-limited send.
+    
+    Args:
+        attempt: Zero-based number of the attempt that failed
+    
+    Returns:
+        Exponential delay capped at 8 seconds, plus jitter
+    """
+    return min(2 ** attempt * 0.25, 8) + random.random() * 0.25
 
-# Load environment variables
-load_dotenv()
 
-# Try to import Twilio (optional dependency)
-try:
-    from twilio.rest import Client
-    from twilio.base.exceptions import TwilioException
-    TWILIO_AVAILABLE = True
-except ImportError:
-    TWILIO_AVAILABLE = False
-    print("Warning: Twilio not installed. SMS features will be simulated.")
+def _messages_per_second() -> int:
+    """Get the allowed send rate from TWILIO_MPS (at least 1)."""
+    return max(1, int(os.getenv('TWILIO_MPS', '1')))
+
+
+@lru_cache(maxsize=4096)
+def _format_phone_number(phone: str) -> str:
+    """
+    Format a phone number for the Twilio API, memoized since the same
+    client numbers recur across confirmations and reminders.
+    
+    Args:
+        phone: Raw phone number input
+    
+    Returns:
+        E.164 formatted phone number
+    """
+    # Remove all non-digit characters except +
+    cleaned = NON_E164_RE.sub('', phone)
+    
+    # Convert local South African numbers to international format
+    if cleaned.startswith('0'):
+        cleaned = '+27' + cleaned[1:]
+    elif not cleaned.startswith('+'):
+        cleaned = '+27' + cleaned
+    
+    return cleaned
 
 
 class SMSManager:
@@ -39,14 +113,32 @@ class SMSManager:
         self.account_sid = os.getenv('TWILIO_ACCOUNT_SID')
         self.auth_token = os.getenv('TWILIO_AUTH_TOKEN')
         self.phone_number = os.getenv('TWILIO_PHONE_NUMBER')
+        # A Messaging Service spreads traffic over its number pool, so it
+        # takes precedence over sending from a single long code
+        self.messaging_service_sid = os.getenv('TWILIO_MESSAGING_SERVICE_SID')
+        if self.messaging_service_sid:
+            self.sender = {'messaging_service_sid': self.messaging_service_sid}
+        else:
+            self.sender = {'from_': self.phone_number}
+        # Notify delivers one body to many recipients in a single request
+        self.notify_service_sid = os.getenv('TWILIO_NOTIFY_SERVICE_SID')
+        
+        # Per-client daily cap, protecting credits from runaway resends. Counts
+        # are kept in the salon database (resolved like app.py does) so all
+        # processes sending SMS share them.
+        self.max_per_client_per_day = int(os.getenv('MAX_SMS_PER_CLIENT_PER_DAY', '3'))
+        self.quota_db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                          os.getenv('DATABASE_PATH', 'salon_data.db'))
         
         if self.account_sid and self.auth_token and TWILIO_AVAILABLE:
+            from twilio.rest import Client
             self.client = Client(self.account_sid, self.auth_token)
             self.is_configured = True
         else:
             self.client = None
             self.is_configured = False
             if not TWILIO_AVAILABLE:
+                print("Warning: Twilio not installed. SMS features will be simulated.")
                 print("Note: Install Twilio with 'pip install twilio' to enable SMS")
             else:
                 print("Warning: Twilio credentials not configured. SMS will be logged only.")
@@ -61,16 +153,21 @@ class SMSManager:
         Returns:
             E.164 formatted phone number
         """
-        # Remove all non-digit characters except +
-        cleaned = ''.join(c for c in phone if c.isdigit() or c == '+')
+        return _format_phone_number(phone)
+    
+    def _take_daily_quota(self, phone: str) -> bool:
+        """
+        Count a message against a client's daily limit.
         
-        # Convert local South African numbers to international format
-        if cleaned.startswith('0'):
-            cleaned = '+27' + cleaned[1:]
-        elif not cleaned.startswith('+'):
-            cleaned = '+27' + cleaned
+        Args:
+            phone: E.164 formatted phone number
         
-        return cleaned
+        Returns:
+            True if the message may be sent, False if the limit is reached
+        """
+        return _get_db(self.quota_db_path).take_sms_quota(
+            phone, date.today().isoformat(), self.max_per_client_per_day
+        )
     
     def send_sms(self, to: str, message: str) -> Dict:
         """
@@ -85,32 +182,269 @@ class SMSManager:
         """
         formatted_phone = self.format_phone_number(to)
         
+        if not self._take_daily_quota(formatted_phone):
+            return {
+                'success': False,
+                'error': 'daily_limit'
+            }
+        
         if self.is_configured and self.client:
+            from twilio.base.exceptions import TwilioException, TwilioRestException
+            
+            for attempt in range(SMS_MAX_ATTEMPTS):
+                try:
+                    msg = self.client.messages.create(
+                        body=message,
+                        to=formatted_phone,
+                        **self.sender
+                    )
+                    return {
+                        'success': True,
+                        'message_id': msg.sid,
+                        'status': msg.status
+                    }
+                except TwilioRestException as e:
+                    # Back off and retry when Twilio reports a rate limit
+                    rate_limited = e.status == 429 or e.code in RETRYABLE_TWILIO_CODES
+                    if not rate_limited or attempt == SMS_MAX_ATTEMPTS - 1:
+                        return {
+                            'success': False,
+                            'error': str(e)
+                        }
+                    time.sleep(_backoff_delay(attempt))
+                except TwilioException as e:
+                    return {
+                        'success': False,
+                        'error': str(e)
+                    }
+        else:
+            return self._simulate_sms(formatted_phone, message)
+    
+    def send_bulk(self, messages: List[Tuple[str, str]]) -> List[Dict]:
+        """
+        Send many SMS messages, batching recipients that share a message body
+        into Twilio Notify requests when TWILIO_NOTIFY_SERVICE_SID is set.
+        Bodies with a single recipient, and every message when Notify is not
+        configured, go through send_sms() instead.
+        
+        Args:
+            messages: List of (recipient phone number, message content) pairs
+        
+        Returns:
+            List of result dictionaries, in the same order as messages
+        """
+        if not (self.notify_service_sid and self.is_configured and self.client):
+            return [self.send_sms(to, message) for to, message in messages]
+        from twilio.base.exceptions import TwilioException
+        
+        results: List[Dict] = [None] * len(messages)
+        grouped: Dict[str, List[Tuple[int, str]]] = {}
+        for index, (to, message) in enumerate(messages):
+            grouped.setdefault(message, []).append((index, to))
+        
+        by_body: Dict[str, List[Tuple[int, str]]] = {}
+        for message, group in grouped.items():
+            if len(group) == 1:
+                index, to = group[0]
+                results[index] = self.send_sms(to, message)
+                continue
+            for index, to in group:
+                formatted_phone = self.format_phone_number(to)
+                if self._take_daily_quota(formatted_phone):
+                    by_body.setdefault(message, []).append((index, formatted_phone))
+                else:
+                    results[index] = {
+                        'success': False,
+                        'error': 'daily_limit'
+                    }
+        
+        notifications = self.client.notify.v1.services(self.notify_service_sid).notifications
+        for body, recipients in by_body.items():
+            for start in range(0, len(recipients), NOTIFY_MAX_BINDINGS):
+                chunk = recipients[start:start + NOTIFY_MAX_BINDINGS]
+                bindings = [json.dumps({'binding_type': 'sms', 'address': phone})
+                            for _, phone in chunk]
+                try:
+                    notification = notifications.create(to_binding=bindings, body=body)
+                    result = {
+                        'success': True,
+                        'notification_id': notification.sid
+                    }
+                except TwilioException as e:
+                    result = {
+                        'success': False,
+                        'error': str(e)
+                    }
+                for index, _ in chunk:
+                    results[index] = result
+        
+        return results
+    
+    async def send_sms_async(self, client: 'httpx.AsyncClient', to: str, message: str) -> Dict:
+        """
+        Send an SMS message through the Twilio REST API without blocking,
+        so one event loop can keep many sends in flight.
+        
+        Args:
+            client: Shared httpx.AsyncClient
+            to: Recipient phone number
+            message: SMS message content
+        
+        Returns:
+            Dictionary with success status and details
+        """
+        import httpx
+        
+        formatted_phone = self.format_phone_number(to)
+        
+        if not self._take_daily_quota(formatted_phone):
+            return {
+                'success': False,
+                'error': 'daily_limit'
+            }
+        
+        if not (self.account_sid and self.auth_token):
+            return self._simulate_sms(formatted_phone, message)
+        
+        data = {'To': formatted_phone, 'Body': message}
+        if self.messaging_service_sid:
+            data['MessagingServiceSid'] = self.messaging_service_sid
+        else:
+            data['From'] = self.phone_number
+        url = TWILIO_MESSAGES_URL.format(sid=self.account_sid)
+        
+        for attempt in range(SMS_MAX_ATTEMPTS):
             try:
-                msg = self.client.messages.create(
-                    body=message,
-                    from_=self.phone_number,
-                    to=formatted_phone
-                )
+                response = await client.post(url, data=data, auth=(self.account_sid, self.auth_token))
+                payload = response.json()
+            except (httpx.HTTPError, ValueError) as e:
+                return {
+                    'success': False,
+                    'error': str(e)
+                }
+            
+            if response.status_code < 400:
                 return {
                     'success': True,
-                    'message_id': msg.sid,
-                    'status': msg.status
+                    'message_id': payload['sid'],
+                    'status': payload['status']
                 }
-            except TwilioException as e:
+            
+            # Back off and retry when Twilio reports a rate limit
+            rate_limited = response.status_code == 429 or payload.get('code') in RETRYABLE_TWILIO_CODES
+            if not rate_limited or attempt == SMS_MAX_ATTEMPTS - 1:
                 return {
                     'success': False,
-                    'error': str(e)
+                    'error': payload.get('message', f"HTTP {response.status_code} error")
                 }
-        else:
-            # Log message for debugging when not configured
-            print(f"\n[SMS SIMULATION] To: {formatted_phone}")
-            print(f"Message: {message}\n")
-            return {
-                'success': True,
-                'simulated': True,
-                'message': 'SMS simulated (not configured)'
-            }
+            retry_after = response.headers.get('Retry-After', '')
+            await asyncio.sleep(float(retry_after) if retry_after.isdigit() else _backoff_delay(attempt))
+    
+    def _simulate_sms(self, formatted_phone: str, message: str) -> Dict:
+        """
+        Log a message instead of sending it when SMS is not configured.
+        
+        Args:
+            formatted_phone: E.164 formatted phone number
+            message: SMS message content
+        
+        Returns:
+            Dictionary marking the send as simulated
+        """
+        # Log message for debugging when not configured
+        print(f"\n[SMS SIMULATION] To: {formatted_phone}")
+        print(f"Message: {message}\n")
+        return {
+            'success': True,
+            'simulated': True,
+            'message': 'SMS simulated (not configured)'
+        }
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting how many messages are sent per second.
+    Twilio long codes accept about 1 message per second, so reminder
+    batches are paced to the account's allowed rate (TWILIO_MPS).
+    """
+    
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        Initialize the bucket full.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (defaults to rate)
+        """
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+@lru_cache(maxsize=1)
+def get_sms_manager() -> SMSManager:
+    """
+    Get the shared SMS manager, created on first use.
+    Reusing one manager keeps the Twilio client and its HTTP
+    connection pool alive across messages.
+    
+    Returns:
+        The process-wide SMSManager instance
+    """
+    return SMSManager()
+
+
+# Message templates, filled in with str.format_map per send
+_CONFIRMATION_HEAD = (
+    "Hi {client_name}! Your booking at Belle Madame Salon is confirmed.\n\n"
+    "Service: {service_name}\n"
+    "Date: {formatted_date}\n"
+    "Time: {time_str}"
+)
+_CONFIRMATION_FOOT = "\n\nReply CANCEL to cancel your appointment."
+_CONFIRMATION_TMPL = _CONFIRMATION_HEAD + _CONFIRMATION_FOOT
+_CONFIRMATION_TMPL_STAFF = _CONFIRMATION_HEAD + "\nStaff: {staff_name}" + _CONFIRMATION_FOOT
+
+_REMINDER_TMPL = (
+    "Reminder: Hi {client_name}, you have an appointment at Belle Madame Salon tomorrow!\n\n"
+    "Service: {service_name}\n"
+    "Time: {time_str}\n\n"
+    "We look forward to seeing you!"
+)
+
+
+@lru_cache(maxsize=512)
+def _pretty_date(date_str: str, fmt: str) -> str:
+    """
+    Reformat a YYYY-MM-DD date for display, memoized since a reminder
+    batch formats the same date for every booking.
+    
+    Args:
+        date_str: Date in YYYY-MM-DD format
+        fmt: strftime format for the output
+    
+    Returns:
+        Formatted date, or date_str unchanged if it cannot be parsed
+    """
+    try:
+        return date.fromisoformat(date_str).strftime(fmt)
+    except ValueError:
+        return date_str
 
 
 def generate_confirmation_message(client_name: str, service_name: str, 
@@ -130,25 +464,17 @@ def generate_confirmation_message(client_name: str, service_name: str,
         Formatted confirmation message
     """
     # Parse date for nicer formatting
-    try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        formatted_date = date_obj.strftime('%A, %d %B %Y')
-    except ValueError:
-        formatted_date = date_str
-    
-    time_str = f"{hour:02d}:00"
-    
-    message = f"Hi {client_name}! Your booking at Belle Madame Salon is confirmed.\n\n"
-    message += f"Service: {service_name}\n"
-    message += f"Date: {formatted_date}\n"
-    message += f"Time: {time_str}"
-    
-    if staff_name:
-        message += f"\nStaff: {staff_name}"
-    
-    message += "\n\nReply CANCEL to cancel your appointment."
-    
-    return message
+    formatted_date = _pretty_date(date_str, '%A, %d %B %Y')
+    time_str = _HOUR_STR[hour]
+    
+    template = _CONFIRMATION_TMPL_STAFF if staff_name else _CONFIRMATION_TMPL
+    return template.format_map({
+        'client_name': client_name,
+        'service_name': service_name,
+        'formatted_date': formatted_date,
+        'time_str': time_str,
+        'staff_name': staff_name
+    })
 
 
 def generate_reminder_message(client_name: str, service_name: str,
@@ -165,20 +491,11 @@ def generate_reminder_message(client_name: str, service_name: str,
     Returns:
         Formatted reminder message
     """
-    try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        formatted_date = date_obj.strftime('%A, %d %B')
-    except ValueError:
-        formatted_date = date_str
-    
-    time_str = f"{hour:02d}:00"
-    
-    message = f"Reminder: Hi {client_name}, you have an appointment at Belle Madame Salon tomorrow!\n\n"
-    message += f"Service: {service_name}\n"
-    message += f"Time: {time_str}\n\n"
-    message += "We look forward to seeing you!"
-    
-    return message
+    return _REMINDER_TMPL.format_map({
+        'client_name': client_name,
+        'service_name': service_name,
+        'time_str': _HOUR_STR[hour]
+    })
 
 
 def send_confirmation_sms(phone: str, client_name: str, service_name: str,
@@ -197,9 +514,8 @@ def send_confirmation_sms(phone: str, client_name: str, service_name: str,
     Returns:
         SMS send result dictionary
     """
-    sms_manager = SMSManager()
     message = generate_confirmation_message(client_name, service_name, date, hour, staff_name)
-    return sms_manager.send_sms(phone, message)
+    return get_sms_manager().send_sms(phone, message)
 
 
 def send_reminder_sms(phone: str, client_name: str, service_name: str,
@@ -217,88 +533,395 @@ def send_reminder_sms(phone: str, client_name: str, service_name: str,
     Returns:
         SMS send result dictionary
     """
-    sms_manager = SMSManager()
     message = generate_reminder_message(client_name, service_name, date, hour)
-    return sms_manager.send_sms(phone, message)
+    return get_sms_manager().send_sms(phone, message)
 
 
-def process_reminders(db_path: str = None) -> Dict:
+def _get_reminder_scheduler() -> 'BackgroundScheduler':
     """
-    Process reminders for all appointments tomorrow.
+    Get the in-process scheduler for one-off reminder jobs, started on first use.
+    The lock keeps concurrent first bookings from starting two schedulers.
+    
+    Returns:
+        The running BackgroundScheduler
+    """
+    global _reminder_scheduler
+    with _reminder_scheduler_lock:
+        if _reminder_scheduler is None:
+            from apscheduler.schedulers.background import BackgroundScheduler
+            
+            scheduler = BackgroundScheduler()
+            scheduler.start()
+            _reminder_scheduler = scheduler
+    return _reminder_scheduler
+
+
+@lru_cache(maxsize=4)
+def _get_db(db_path: str = None) -> 'DatabaseManager':
+    """
+    Get a shared DatabaseManager for a database file, so repeated reminder
+    runs reuse its connection pool instead of reopening the database.
     
     Args:
         db_path: Path to the database file
     
     Returns:
-        Dictionary with processing results
+        DatabaseManager with the sent-reminders table in place
     """
     from database import DatabaseManager
     
     db = DatabaseManager(db_path)
+    db.ensure_reminder_log()
+    return db
+
+
+def _iso_date(date_str: str) -> str:
+    """
+    Normalize a stored booking date, which may lack zero padding
+    (e.g. 2027-1-5), to YYYY-MM-DD.
     
-    # Calculate tomorrow's date
-    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    Args:
+        date_str: Date as stored in the bookings table
     
-    # Get all bookings for tomorrow
-    bookings = db.get_bookings_for_reminder(tomorrow)
+    Returns:
+        Date in YYYY-MM-DD format, or None if it cannot be parsed
+    """
+    try:
+        return datetime.strptime(date_str, '%Y-%m-%d').date().isoformat()
+    except (TypeError, ValueError):
+        return None
+
+
+def _send_scheduled_reminder(booking: Dict, db_path: str = None) -> Dict:
+    """
+    Send a queued reminder unless it has already been claimed for that date,
+    or the booking has since been deleted or moved (e.g. in the desktop app).
+    
+    Args:
+        booking: Dictionary with id, phone, client_name, service_name, date and hour
+        db_path: Path to the database file
+    
+    Returns:
+        SMS send result dictionary
+    """
+    db = _get_db(db_path)
+    current = db.get_booking_by_id(booking['id'])
+    if (current is None or current['hour'] != booking['hour']
+            or _iso_date(current['date']) != booking['date']):
+        return {'success': True, 'skipped': True, 'message': 'Booking cancelled or moved'}
+    
+    # Claim before sending so the daily batch cannot send it as well
+    if not db.claim_reminder(booking['id'], booking['date']):
+        return dict(_ALREADY_SENT)
+    
+    result = send_reminder_sms(current['phone'], current['client_name'],
+                               current['service_name'], booking['date'], booking['hour'])
+    if not result['success'] or result.get('simulated'):
+        db.release_reminder(booking['id'], booking['date'])
+    return result
+
+
+def schedule_reminder(booking: Dict, send_at: datetime = None, db_path: str = None) -> bool:
+    """
+    Queue a one-off reminder for a booking when it is created, so the
+    reminder does not depend on a later scan of the whole day's bookings.
+    When the job fires it re-reads the booking by id and skips it if it
+    was deleted or moved. Jobs live in this process only; process_reminders
+    remains the catch-up path after a restart.
+    
+    Args:
+        booking: Dictionary with id, phone, client_name, service_name, date and hour
+        send_at: When to send (defaults to 24 hours before the appointment)
+        db_path: Path to the database file recording sent reminders
+    
+    Returns:
+        True if the reminder was queued, False if APScheduler is not
+        installed or the appointment is today or already past
+    """
+    if not APSCHEDULER_AVAILABLE:
+        return False
+    from apscheduler.triggers.date import DateTrigger
+    
+    appointment_day = date.fromisoformat(booking['date'])
+    appointment = datetime.combine(appointment_day, datetime.min.time()) + timedelta(hours=booking['hour'])
+    if send_at is None:
+        send_at = appointment - timedelta(hours=24)
+    
+    now = datetime.now()
+    if send_at <= now:
+        # Too late for the 24-hour mark: remind right away if the appointment
+        # is tomorrow (as the daily scan would), but not for same-day bookings,
+        # which were just confirmed and whose reminder text says "tomorrow"
+        if appointment_day <= now.date() or appointment <= now:
+            return False
+        trigger = None  # run once, immediately
+    else:
+        trigger = DateTrigger(run_date=send_at)
+    
+    _get_reminder_scheduler().add_job(
+        _send_scheduled_reminder,
+        trigger,
+        args=(booking, db_path),
+        id=f"reminder-{booking['id']}",
+        replace_existing=True
+    )
+    return True
+
+
+def _start_reminder_batch(db: 'DatabaseManager', reminder_date: str) -> Tuple[List, List[str], Dict]:
+    """
+    Load the bookings still to be reminded for a date and build their messages.
+    
+    Args:
+        db: Database to read bookings from
+        reminder_date: Date in YYYY-MM-DD format
+    
+    Returns:
+        Tuple of (bookings, messages, results) where results is the
+        report dictionary to fill in as sends complete
+    """
+    # Get all bookings for the date, skipping any already reminded. Each
+    # send still claims its reminder first, since other senders may run
+    # while the batch is in progress
+    already_sent = db.get_sent_reminders(reminder_date)
+    all_bookings = db.get_bookings_for_reminder(reminder_date)
+    bookings = [booking for booking in all_bookings if booking['id'] not in already_sent]
     
     results = {
-        'date': tomorrow,
-        'total_bookings': len(bookings),
+        'date': reminder_date,
+        'total_bookings': len(all_bookings),
         'sent': 0,
         'failed': 0,
+        'skipped': len(all_bookings) - len(bookings),
         'details': []
     }
     
-    print(f"\n{'='*60}")
-    print(f"Processing reminders for {tomorrow}")
-    print(f"Found {len(bookings)} bookings")
-    print(f"{'='*60}\n")
+    print(f"\n{_BANNER}")
+    print(f"Processing reminders for {reminder_date}")
+    print(f"Found {len(all_bookings)} bookings")
+    if results['skipped']:
+        print(f"Skipping {results['skipped']} already reminded")
+    print(f"{_BANNER}\n")
+    
+    # Build every message up front; nothing in them varies per send
+    messages = [
+        generate_reminder_message(booking['client_name'], booking['service_name'],
+                                  reminder_date, booking['hour'])
+        for booking in bookings
+    ]
+    return bookings, messages, results
+
+
+def _record_reminder_result(db: 'DatabaseManager', booking, result: Dict, reminder_date: str) -> str:
+    """
+    Release the claim on a reminder that was not really delivered and
+    describe the outcome. Simulated sends are released too, so the reminder
+    still goes out once SMS is configured.
     
-    for booking in bookings:
-        client_name = booking['client_name']
-        phone = booking['phone']
-        service_name = booking['service_name']
-        hour = booking['hour']
-        
-        result = send_reminder_sms(phone, client_name, service_name, tomorrow, hour)
-        
-        status = 'SENT' if result['success'] else 'FAILED'
-        results['details'].append({
-            'client': client_name,
-            'phone': phone[:4] + '****',  # Mask phone for privacy
-            'service': service_name,
-            'time': f"{hour:02d}:00",
-            'status': status
-        })
-        
-        if result['success']:
-            results['sent'] += 1
-            print(f"  [✓] {client_name} - {service_name} at {hour:02d}:00")
-        else:
-            results['failed'] += 1
-            print(f"  [✗] {client_name} - {service_name} at {hour:02d}:00 - {result.get('error', 'Unknown error')}")
+    Args:
+        db: Database recording sent reminders
+        booking: The reminded booking row
+        result: SMS send result dictionary
+        reminder_date: Date in YYYY-MM-DD format
     
-    print(f"\n{'='*60}")
+    Returns:
+        Log line for the batch report
+    """
+    line = f"{booking['client_name']} - {booking['service_name']} at {_HOUR_STR[booking['hour']]}"
+    if result.get('skipped'):
+        return f"  [-] {line} - {result['message']}"
+    if not result['success'] or result.get('simulated'):
+        db.release_reminder(booking['id'], reminder_date)
+    if result['success']:
+        return f"  [✓] {line}"
+    return f"  [✗] {line} - {result.get('error', 'Unknown error')}"
+
+
+def _finish_reminder_batch(results: Dict, bookings: List, outcomes: List[Dict],
+                           log_lines: List[str]):
+    """
+    Fill in the batch report once all sends are done and print it.
+    
+    Args:
+        results: Report dictionary from _start_reminder_batch
+        bookings: The reminded booking rows
+        outcomes: SMS send results, aligned with bookings
+        log_lines: Per-booking log lines from _record_reminder_result
+    """
+    # Drop reminders another sender claimed while the batch was running
+    sent = [(booking, outcome) for booking, outcome in zip(bookings, outcomes)
+            if not outcome.get('skipped')]
+    results['skipped'] += len(bookings) - len(sent)
+    bookings = [booking for booking, _ in sent]
+    statuses = [outcome['success'] for _, outcome in sent]
+    results['sent'] = sum(statuses)
+    results['failed'] = len(statuses) - results['sent']
+    results['details'] = [
+        {
+            'client': booking['client_name'],
+            'phone': booking['phone'][:4] + '****',  # Mask phone for privacy
+            'service': booking['service_name'],
+            'time': _HOUR_STR[booking['hour']],
+            'status': 'SENT' if ok else 'FAILED'
+        }
+        for booking, ok in zip(bookings, statuses)
+    ]
+    
+    # Write the per-booking lines in one go rather than a print per send
+    if log_lines:
+        sys.stdout.write('\n'.join(log_lines) + '\n')
+    print(f"\n{_BANNER}")
     print(f"Summary: {results['sent']} sent, {results['failed']} failed")
-    print(f"{'='*60}\n")
+    print(f"{_BANNER}\n")
+
+
+def process_reminders(db_path: str = None) -> Dict:
+    """
+    Process reminders for all appointments tomorrow.
+    
+    Args:
+        db_path: Path to the database file
+    
+    Returns:
+        Dictionary with processing results
+    """
+    db = _get_db(db_path)
+    
+    # Calculate tomorrow's date
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    bookings, messages, results = _start_reminder_batch(db, tomorrow)
+    
+    sms_manager = get_sms_manager()
+    outcomes: List[Dict] = [None] * len(bookings)
+    log_lines: List[str] = []
+    pending = list(range(len(bookings)))
+    
+    if sms_manager.notify_service_sid:
+        # Hand bodies shared by several clients to Notify; Twilio queues and
+        # paces delivery. Everything else uses the paced send below.
+        body_counts: Dict[str, int] = {}
+        for message in messages:
+            body_counts[message] = body_counts.get(message, 0) + 1
+        shared = [index for index in pending if body_counts[messages[index]] > 1]
+        pending = [index for index in pending if body_counts[messages[index]] == 1]
+        for index in shared:
+            if not db.claim_reminder(bookings[index]['id'], tomorrow):
+                outcomes[index] = dict(_ALREADY_SENT)
+                log_lines.append(_record_reminder_result(db, bookings[index], outcomes[index], tomorrow))
+        shared = [index for index in shared if outcomes[index] is None]
+        bulk_outcomes = sms_manager.send_bulk(
+            [(bookings[index]['phone'], messages[index]) for index in shared]
+        )
+        for index, result in zip(shared, bulk_outcomes):
+            outcomes[index] = result
+            log_lines.append(_record_reminder_result(db, bookings[index], result, tomorrow))
+    
+    # Send in parallel, paced to the allowed messages per second
+    rate = _messages_per_second()
+    limiter = TokenBucket(rate)
+    
+    def send_one(booking, message: str) -> Dict:
+        if not db.claim_reminder(booking['id'], tomorrow):
+            return dict(_ALREADY_SENT)
+        limiter.acquire()
+        return sms_manager.send_sms(booking['phone'], message)
+    
+    with ThreadPoolExecutor(max_workers=min(32, 4 * rate)) as pool:
+        futures = {
+            pool.submit(send_one, bookings[index], messages[index]): index
+            for index in pending
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            outcomes[index] = future.result()
+            log_lines.append(_record_reminder_result(db, bookings[index], outcomes[index], tomorrow))
+    
+    _finish_reminder_batch(results, bookings, outcomes, log_lines)
+    return results
+
+
+async def process_reminders_async(db_path: str = None) -> Dict:
+    """
+    Process reminders for all appointments tomorrow on one event loop,
+    sending over async HTTP instead of a thread per in-flight message.
+    Falls back to process_reminders() when httpx is not installed.
     
+    Args:
+        db_path: Path to the database file
+    
+    Returns:
+        Dictionary with processing results
+    """
+    if not HTTPX_AVAILABLE:
+        print("Note: Install httpx with 'pip install httpx' to send reminders asynchronously")
+        return process_reminders(db_path)
+    import httpx
+    
+    db = _get_db(db_path)
+    
+    # Calculate tomorrow's date
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    bookings, messages, results = _start_reminder_batch(db, tomorrow)
+    
+    sms_manager = get_sms_manager()
+    gate = asyncio.Semaphore(_messages_per_second())
+    
+    async def send_one(client: httpx.AsyncClient, booking, message: str) -> Dict:
+        if not db.claim_reminder(booking['id'], tomorrow):
+            return dict(_ALREADY_SENT)
+        # Hold each slot for at least a second to stay within the allowed rate
+        async with gate:
+            started = time.monotonic()
+            result = await sms_manager.send_sms_async(client, booking['phone'], message)
+            await asyncio.sleep(max(0.0, 1.0 - (time.monotonic() - started)))
+        return result
+    
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        outcomes = await asyncio.gather(
+            *[send_one(client, booking, message) for booking, message in zip(bookings, messages)],
+            return_exceptions=True
+        )
+    
+    outcomes = [
+        {'success': False, 'error': str(outcome)} if isinstance(outcome, Exception) else outcome
+        for outcome in outcomes
+    ]
+    log_lines = [
+        _record_reminder_result(db, booking, outcome, tomorrow)
+        for booking, outcome in zip(bookings, outcomes)
+    ]
+    
+    _finish_reminder_batch(results, bookings, outcomes, log_lines)
     return results
 
 
 def run_scheduler():
     """
-    Run the reminder scheduler in a continuous loop.
-    Checks for appointments every hour.
+    Run the reminder scheduler until interrupted.
     
-    Note: For production, consider using a proper task scheduler
-    like Celery, APScheduler, or cron jobs.
+    With APScheduler installed, reminders are sent on the crontab schedule
+    in REMINDER_CRON (default '0 18 * * *', daily at 18:00). Without it,
+    falls back to checking for appointments every hour.
     """
-    import time
-    
     print("Starting SMS Reminder Scheduler...")
     print("Press Ctrl+C to stop\n")
     
+    if APSCHEDULER_AVAILABLE:
+        from apscheduler.schedulers.blocking import BlockingScheduler
+        from apscheduler.triggers.cron import CronTrigger
+        
+        # Fire at exact wall-clock times instead of waking up every hour
+        cron = os.getenv('REMINDER_CRON', '0 18 * * *')
+        scheduler = BlockingScheduler()
+        scheduler.add_job(process_reminders, CronTrigger.from_crontab(cron))
+        print(f"Reminders scheduled for '{cron}'")
+        try:
+            scheduler.start()
+        except (KeyboardInterrupt, SystemExit):
+            print("\nScheduler stopped.")
+        return
+    
+    print("Note: Install APScheduler with 'pip install apscheduler' for cron scheduling")
     check_interval = 3600  # Check every hour
     
     while True:
@@ -318,9 +941,22 @@ def run_scheduler():
             time.sleep(60)  # Wait 1 minute on error before retrying
 
 
+def _bootstrap():
+    """Prepare the environment when run as a standalone script."""
+    from dotenv import load_dotenv
+    
+    # Add parent directory to path for imports
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    
+    # Load environment variables
+    load_dotenv()
+
+
 if __name__ == '__main__':
     import argparse
     
+    _bootstrap()
+    
     parser = argparse.ArgumentParser(description='Send appointment reminders')
     parser.add_argument('--remind', action='store_true', 
                        help='Send reminders for tomorrow appointments')
@@ -328,11 +964,15 @@ if __name__ == '__main__':
                        help='Run continuous reminder scheduler')
     parser.add_argument('--db', type=str, 
                        help='Path to database file')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                       help='Send reminders over async HTTP (requires httpx)')
     
     args = parser.parse_args()
     
     if args.scheduler:
         run_scheduler()
+    elif args.remind and args.use_async:
+        asyncio.run(process_reminders_async(args.db))
     elif args.remind:
         process_reminders(args.db)
     else:
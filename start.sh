@@ -7,7 +7,7 @@ echo "=========================================="
 
 # Install dependencies
 echo "Installing dependencies..."
-pip install flask python-dotenv gunicorn
+pip install flask flask-caching python-dotenv gunicorn
 
 # Initialize database if needed
 if [ ! -f "salon_data.db" ]; then
@@ -96,6 +96,9 @@ print('Database created with 49 services!')
 "
 fi
 
+# Ensure tables and indexes are up to date
+flask --app app init-db
+
 echo ""
 echo "=========================================="
 echo "Starting server..."
@@ -103,4 +106,4 @@ echo "=========================================="
 echo ""
 
 # Start with Gunicorn (production)
-gunicorn -w 4 -b 0.0.0.0:$PORT app:app
+gunicorn -c gunicorn.conf.py wsgi:app
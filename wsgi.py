@@ -3,7 +3,9 @@
 Belle Madame Salon Online Booking System
 Production WSGI Entry Point
 
-This file is used by production servers like Gunicorn.
+This file is used by production servers like Gunicorn:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
 """
 from app import app
 